@@ -0,0 +1,145 @@
+"""
+Асинхронный вариант API запросов на asyncpg.
+
+AsyncDatabase держит пул соединений asyncpg и ограничивает количество
+одновременно выполняемых запросов семафором. load_test запускает N независимых
+операций конкурентно и считает пропускную способность и перцентили задержки
+(статистика - benchmark.summarize). Запросы используют параметры $1, $2, ...;
+asyncpg сам подготавливает повторяющиеся выражения на каждом соединении.
+"""
+import asyncio
+import time
+
+try:
+    import asyncpg
+except ImportError:  # Асинхронный режим необязателен
+    asyncpg = None
+
+from benchmark import summarize
+from metrics import Timer
+
+
+class AsyncDatabase:
+    """
+    Асинхронный пул соединений с ограничением конкурентности
+    """
+
+    def __init__(self, *, host, user, password, database, min_size=1, max_size=10, concurrency=None,
+                 metrics=None):
+        """
+        Args:
+            host, user, password, database: Параметры подключения
+            min_size: Минимальное количество соединений пула
+            max_size: Максимальное количество соединений пула
+            concurrency: Максимум одновременно выполняемых запросов; None - равен max_size
+            metrics: Объект QueryMetrics для учета запросов (например, Database.metrics)
+        """
+        if asyncpg is None:
+            raise RuntimeError("Для асинхронного режима требуется пакет asyncpg")
+
+        self.connect_params = {"host": host, "user": user, "password": password, "database": database}
+        self.min_size = min_size
+        self.max_size = max_size
+        self.semaphore = asyncio.Semaphore(concurrency or max_size)
+        self.metrics = metrics
+        self.pool = None
+
+    async def open(self):
+        """Создает пул соединений"""
+        if self.pool is None:
+            self.pool = await asyncpg.create_pool(min_size=self.min_size, max_size=self.max_size,
+                                                  **self.connect_params)
+        return self
+
+    async def close(self):
+        """Закрывает все соединения пула"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+        return False
+
+    async def _run(self, method, query, params):
+        """Выполняет метод соединения с замером этапов connect (ожидание соединения) и execute"""
+        phases = {}
+        result = None
+        error = None
+        async with self.semaphore:
+            try:
+                with Timer(phases, "connect"):
+                    connection = await self.pool.acquire()
+                try:
+                    with Timer(phases, "execute"):
+                        result = await getattr(connection, method)(query, *params)
+                finally:
+                    await self.pool.release(connection)
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                if self.metrics is not None:
+                    rows = len(result) if isinstance(result, list) else None
+                    self.metrics.record(query=query, params=params, phases=phases, rows=rows, error=error)
+        return result
+
+    async def fetch(self, query, *params):
+        """
+        Выполняет SELECT.
+        Returns:
+            list: Строки результата (asyncpg.Record)
+        """
+        return await self._run("fetch", query, params)
+
+    async def execute(self, query, *params):
+        """
+        Выполняет изменяющий запрос в отдельной транзакции (autocommit).
+        Returns:
+            str: Статус команды, например "INSERT 0 1"
+        """
+        return await self._run("execute", query, params)
+
+
+async def load_test(operation, *, requests, concurrency):
+    """
+    Конкурентно выполняет операцию requests раз.
+    Задержка считается от постановки запроса до ответа, включая ожидание свободного соединения.
+    Args:
+        operation: Асинхронная функция, принимающая номер запроса
+        requests: Общее количество запросов
+        concurrency: Количество запросов, одновременно находящихся в работе
+    Returns:
+        dict: Количество запросов и ошибок, общее время, пропускная способность (запросов в секунду)
+              и статистика задержек из benchmark.summarize
+    """
+    latencies = []
+    errors = 0
+    next_request = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for index in next_request:
+            start = time.perf_counter()
+            try:
+                await operation(index)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else None,
+        "latency": summarize(latencies),
+    }
@@ -0,0 +1,284 @@
+"""
+Подсистема замеров производительности запросов.
+
+Сценарий - это функция, выполняющая запрос, и SQL этого запроса для EXPLAIN.
+BenchmarkRunner выполняет прогревочные запуски, затем N замеров через
+time.perf_counter, считает статистику (p50/p95/p99, стандартное отклонение),
+сохраняет план выполнения EXPLAIN (ANALYZE, BUFFERS) и умеет записывать
+результаты в JSON для сравнения между коммитами и размерами данных.
+"""
+import json
+import math
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+# Зарегистрированные сценарии: имя -> фабрика, принимающая объект Database
+SCENARIOS = {}
+
+
+def register_scenario(name):
+    """
+    Декоратор для регистрации фабрики сценария.
+    Args:
+        name: Уникальное имя сценария
+    Returns:
+        decorator: Декоратор, добавляющий фабрику в SCENARIOS
+    """
+    def decorator(factory):
+        SCENARIOS[name] = factory
+        return factory
+
+    return decorator
+
+
+class Scenario:
+    """
+    Описание одного замеряемого сценария
+    """
+
+    def __init__(self, *, name, func, query=None, params=None, setup=None, teardown=None, description=""):
+        """
+        Args:
+            name: Имя сценария
+            func: Функция без аргументов, выполняющая замеряемую операцию
+            query: SQL запрос сценария для EXPLAIN (ANALYZE, BUFFERS); None - без плана
+            params: Параметры SQL запроса
+            setup: Функция, выполняемая один раз перед прогревом (например, создание индекса)
+            teardown: Функция, выполняемая один раз после замеров
+            description: Краткое описание сценария
+        """
+        self.name = name
+        self.func = func
+        self.query = query
+        self.params = params
+        self.setup = setup
+        self.teardown = teardown
+        self.description = description
+
+
+def percentile(sorted_values, percent):
+    """
+    Вычисляет перцентиль методом ближайшего ранга.
+    Args:
+        sorted_values: Отсортированный список значений
+        percent: Перцентиль от 0 до 100
+    Returns:
+        float: Значение перцентиля
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(timings):
+    """
+    Считает статистику по списку замеров.
+    Args:
+        timings: Список времен выполнения в секундах
+    Returns:
+        dict: min, max, mean, stddev, p50, p95, p99
+    """
+    values = sorted(timings)
+    return {
+        "count": len(values),
+        "min": values[0] if values else None,
+        "max": values[-1] if values else None,
+        "mean": statistics.fmean(values) if values else None,
+        "stddev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+
+def plan_scans(plan):
+    """
+    Собирает узлы чтения таблиц из плана EXPLAIN (FORMAT JSON).
+    Args:
+        plan: Узел плана (словарь с ключом "Node Type")
+    Returns:
+        list: Строки вида "Index Scan (idx_name)" или "Seq Scan (employees)"
+    """
+    scans = []
+    node_type = plan.get("Node Type", "")
+    if "Scan" in node_type:
+        target = plan.get("Index Name") or plan.get("Relation Name")
+        scans.append(f"{node_type} ({target})" if target else node_type)
+    for child in plan.get("Plans", []):
+        scans.extend(plan_scans(child))
+    return scans
+
+
+def plan_indexes(plan):
+    """
+    Собирает имена индексов, которые использует план EXPLAIN (FORMAT JSON).
+    Args:
+        plan: Узел плана (словарь с ключом "Node Type")
+    Returns:
+        list: Имена индексов без повторов в порядке появления в плане
+    """
+    names = [plan["Index Name"]] if plan.get("Index Name") else []
+    for child in plan.get("Plans", []):
+        names.extend(name for name in plan_indexes(child) if name not in names)
+    return names
+
+
+def _format_ms(value):
+    """Форматирует время сервера в миллисекундах для таблицы"""
+    return f"{value:.3f}" if value is not None else "-"
+
+
+def _git_commit():
+    """Возвращает хеш текущего коммита или None, если git недоступен"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+class BenchmarkRunner:
+    """
+    Класс для запуска сценариев с прогревом, повторениями и сбором статистики
+    """
+
+    def __init__(self, *, database, warmup=2, repeats=10, explain=True):
+        """
+        Args:
+            database: Объект Database; все замеры идут в одной сессии,
+                      поэтому установка соединения не попадает во время
+            warmup: Количество прогревочных запусков (не учитываются)
+            repeats: Количество замеряемых запусков
+            explain: Сохранять ли план EXPLAIN (ANALYZE, BUFFERS)
+        """
+        self.database = database
+        self.warmup = warmup
+        self.repeats = repeats
+        self.explain = explain
+
+    def explain_query(self, *, query, params=None):
+        """
+        Получает план выполнения запроса.
+        Returns:
+            dict: План в формате JSON, время планирования и выполнения на сервере
+                  (для EXECUTE подготовленного выражения планирование обычно близко к нулю)
+        """
+        rows = self.database.query_the_database(
+            query=f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params=params, fetch=True
+        )
+        if not rows:
+            return None
+        plan = rows[0][0][0]
+        return {
+            "planning_time_ms": plan.get("Planning Time"),
+            "execution_time_ms": plan.get("Execution Time"),
+            "node_type": plan["Plan"].get("Node Type"),
+            "scans": plan_scans(plan["Plan"]),
+            "plan": plan,
+        }
+
+    def run_scenario(self, scenario):
+        """
+        Выполняет сценарий: setup, прогрев, замеры, план, teardown.
+        Args:
+            scenario: Объект Scenario
+        Returns:
+            dict: Результат сценария со статистикой и планом
+        """
+        if scenario.setup:
+            scenario.setup()
+
+        try:
+            for _ in range(self.warmup):
+                scenario.func()
+
+            timings = []
+            result = None
+            for _ in range(self.repeats):
+                start = time.perf_counter()
+                result = scenario.func()
+                timings.append(time.perf_counter() - start)
+
+            plan = None
+            if self.explain and scenario.query:
+                plan = self.explain_query(query=scenario.query, params=scenario.params)
+        finally:
+            if scenario.teardown:
+                scenario.teardown()
+
+        return {
+            "name": scenario.name,
+            "description": scenario.description,
+            "rows": len(result) if isinstance(result, (list, tuple)) else None,
+            "timings": timings,
+            "stats": summarize(timings),
+            "explain": plan,
+        }
+
+    def run(self, names=None):
+        """
+        Выполняет зарегистрированные сценарии.
+        Args:
+            names: Список имен сценариев; None - все зарегистрированные
+        Returns:
+            list: Результаты сценариев
+        """
+        names = names or list(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise ValueError(f"Неизвестные сценарии: {', '.join(unknown)}")
+
+        results = []
+        with self.database.session():
+            for name in names:
+                print(f"[benchmark] {name}: прогрев {self.warmup}, замеров {self.repeats}")
+                results.append(self.run_scenario(SCENARIOS[name](self.database)))
+        return results
+
+    def dataset_info(self):
+        """Возвращает сведения о данных, на которых выполнялись замеры, и профиль набора данных"""
+        rows = self.database.query_the_database(query="SELECT count(*) FROM employees;", fetch=True)
+        return {"rows": rows[0][0] if rows else None, "profile": self.database.latest_dataset_profile()}
+
+    def report(self, results):
+        """
+        Формирует отчет для сохранения в JSON.
+        Args:
+            results: Результаты из run
+        Returns:
+            dict: Отчет с метаданными запуска
+        """
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "settings": {"warmup": self.warmup, "repeats": self.repeats, "explain": self.explain},
+            "dataset": self.dataset_info(),
+            "results": results,
+        }
+
+    @staticmethod
+    def save(report, path):
+        """Записывает отчет в JSON файл"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2, default=str)
+        print(f"Результаты сохранены в {path}")
+
+    @staticmethod
+    def print_results(results):
+        """Выводит таблицу результатов в миллисекундах"""
+        print("\n{:<35} {:>8} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}  {}".format(
+            "Сценарий", "Строк", "p50, мс", "p95, мс", "p99, мс", "stddev",
+            "Планир.", "Выполн.", "Чтение"))
+        print("-" * 130)
+        for result in results:
+            stats = result["stats"]
+            explain = result["explain"] or {}
+            plan = ", ".join(explain.get("scans", [])) or "-"
+            print("{:<35} {:>8} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10} {:>10}  {}".format(
+                result["name"], result["rows"] if result["rows"] is not None else "-",
+                stats["p50"] * 1000, stats["p95"] * 1000, stats["p99"] * 1000, stats["stddev"] * 1000,
+                _format_ms(explain.get("planning_time_ms")), _format_ms(explain.get("execution_time_ms")), plan))
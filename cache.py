@@ -0,0 +1,136 @@
+"""
+Кеш результатов SELECT запросов внутри процесса.
+
+Ключ - нормализованный текст запроса вместе с параметрами. Записи вытесняются
+по принципу LRU, устаревают через TTL и ограничены общим объемом памяти.
+Любая запись в таблицу сбрасывает кеш целиком (см. Database.invalidate_cache).
+"""
+import sys
+import time
+from collections import OrderedDict
+from threading import Lock
+
+# Маркер промаха, так как None может быть закешированным результатом
+MISS = object()
+
+
+class QueryCache:
+    """
+    LRU кеш результатов запросов с TTL и ограничением памяти
+    """
+
+    def __init__(self, *, max_entries=128, ttl=60.0, max_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Максимальное количество записей
+            ttl: Время жизни записи в секундах
+            max_bytes: Максимальный примерный объем всех записей в байтах
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # ключ -> (время записи, размер, результат)
+        self._bytes = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query, params=None):
+        """
+        Формирует ключ кеша: запрос без лишних пробелов и параметры.
+        Returns:
+            tuple: Ключ записи
+        """
+        return " ".join(query.split()), repr(params)
+
+    @staticmethod
+    def estimate_size(rows, sample=100):
+        """
+        Приблизительно оценивает объем результата в памяти по выборке строк.
+        Args:
+            rows: Список строк результата
+            sample: Количество строк для оценки
+        Returns:
+            int: Примерный размер в байтах
+        """
+        if not rows:
+            return sys.getsizeof(rows)
+        sampled = rows[:sample]
+        row_size = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in sampled)
+        return sys.getsizeof(rows) + row_size * len(rows) // len(sampled)
+
+    def get(self, key):
+        """
+        Возвращает закешированный результат или MISS.
+        Args:
+            key: Ключ из make_key
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISS
+
+            stored_at, size, rows = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._bytes -= size
+                self.misses += 1
+                return MISS
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def put(self, key, rows):
+        """
+        Сохраняет результат; слишком большие результаты не кешируются.
+        Args:
+            key: Ключ из make_key
+            rows: Результат запроса
+        """
+        size = self.estimate_size(rows)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (time.monotonic(), size, rows)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self):
+        """Сбрасывает все записи после изменения данных"""
+        with self._lock:
+            if self._entries:
+                self._entries.clear()
+                self._bytes = 0
+            self.invalidations += 1
+
+    def stats(self):
+        """
+        Возвращает счетчики кеша.
+        Returns:
+            dict: Попадания, промахи, доля попаданий, записи, объем, вытеснения, сбросы
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -2,3 +2,29 @@ host = "localhost"
 user = "postgres"
 password = "your_password"
 db_name = "employee_directory"
+
+# Параметры пула соединений
+pool_min_size = 1
+pool_max_size = 5
+
+# Количество строк, получаемых серверным курсором за один раз
+stream_chunk_size = 10000
+
+# Кеш результатов запросов EmployeeView (внутри процесса)
+query_cache_enabled = False
+query_cache_max_entries = 128
+query_cache_ttl = 60  # секунд
+query_cache_max_bytes = 256 * 1024 * 1024
+
+# Количество записей, проверяемых и загружаемых за один раз при импорте из файла
+import_chunk_size = 50000
+
+# Логирование и метрики запросов
+log_level = "INFO"  # DEBUG выводит каждый выполненный SQL запрос
+slow_query_threshold = 0.5  # секунд; None - не записывать медленные запросы
+slow_query_log = "slow_queries.log"  # JSON lines
+metrics_file = None  # Путь для выгрузки метрик в формате Prometheus при завершении
+
+# Асинхронный пул для нагрузочного теста (режим 17)
+async_pool_max_size = 20
+async_concurrency = 50  # одновременно выполняемых запросов
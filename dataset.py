@@ -0,0 +1,281 @@
+"""
+Профили синтетических наборов данных для замеров производительности.
+
+Профиль задает количество строк, размеры пулов имен, Zipf-перекос фамилий,
+долю строк, попадающих под поиск мужчин с фамилией на 'F', долю мужчин и seed.
+DatasetGenerator выдает данные партиями; каждая партия генерируется собственным
+генератором, зависящим только от seed и номера партии, поэтому набор данных
+воспроизводится независимо от количества процессов загрузки.
+"""
+import io
+import random
+
+try:
+    import numpy as np
+except ImportError:  # Генератор профилей работает только с NumPy
+    np = None
+
+ROWS_MIN = 10000
+ROWS_MAX = 100000000
+
+# Слоги для синтетических имен: только английские буквы, как требует валидация ФИО
+CONSONANTS = "bcdghklmnprstvz"
+VOWELS = "aeiou"
+# Первые буквы фамилий, не попадающих под поиск на 'F'
+NON_F_INITIALS = "ABCDEGHIJKLMNOPRSTVWZ"
+
+
+class DatasetProfile:
+    """
+    Параметры синтетического набора данных
+    """
+    FIELDS = ("name", "rows", "surnames", "f_surnames", "male_names", "female_names", "middle_names",
+              "zipf", "f_selectivity", "male_ratio", "seed", "batch_size")
+
+    def __init__(self, *, name="custom", rows=1000000, surnames=1000, f_surnames=50, male_names=200,
+                 female_names=200, middle_names=200, zipf=0.0, f_selectivity=0.0001, male_ratio=0.5,
+                 seed=None, batch_size=100000):
+        """
+        Args:
+            name: Имя профиля
+            rows: Общее количество строк (от ROWS_MIN до ROWS_MAX)
+            surnames: Размер пула фамилий, не начинающихся на 'F'
+            f_surnames: Размер пула фамилий на 'F'
+            male_names, female_names, middle_names: Размеры пулов мужских, женских имен и отчеств
+            zipf: Показатель Zipf-распределения фамилий; 0 - равномерное распределение
+            f_selectivity: Доля строк, которую возвращает поиск мужчин с фамилией на 'F'
+            male_ratio: Доля мужчин среди всех строк
+            seed: Начальное значение генераторов; None - выбирается случайно и сохраняется в профиле
+            batch_size: Размер партии генерации и загрузки
+        """
+        self.name = name
+        self.rows = int(rows)
+        self.surnames = int(surnames)
+        self.f_surnames = int(f_surnames)
+        self.male_names = int(male_names)
+        self.female_names = int(female_names)
+        self.middle_names = int(middle_names)
+        self.zipf = float(zipf)
+        self.f_selectivity = float(f_selectivity)
+        self.male_ratio = float(male_ratio)
+        self.seed = int(seed) if seed is not None else random.randrange(2 ** 31)
+        self.batch_size = int(batch_size)
+        self.validate()
+
+    def validate(self):
+        """Проверяет параметры профиля и вызывает ValueError при ошибке"""
+        if not ROWS_MIN <= self.rows <= ROWS_MAX:
+            raise ValueError(f"Количество строк должно быть от {ROWS_MIN} до {ROWS_MAX}")
+        for field in ("surnames", "f_surnames", "male_names", "female_names", "middle_names", "batch_size"):
+            if getattr(self, field) < 1:
+                raise ValueError(f"Параметр {field} должен быть положительным")
+        if self.zipf < 0:
+            raise ValueError("Показатель zipf не может быть отрицательным")
+        if not 0 <= self.male_ratio <= 1:
+            raise ValueError("Доля мужчин должна быть от 0 до 1")
+        if not 0 <= self.f_selectivity <= self.male_ratio:
+            raise ValueError("Селективность поиска на 'F' должна быть от 0 до доли мужчин")
+
+    @property
+    def f_rows(self):
+        """Количество мужчин с фамилией на 'F'"""
+        return round(self.rows * self.f_selectivity)
+
+    @property
+    def male_rows(self):
+        """Количество мужчин, включая мужчин с фамилией на 'F'"""
+        return max(round(self.rows * self.male_ratio), self.f_rows)
+
+    def to_dict(self):
+        """
+        Возвращает параметры профиля и ожидаемые количества строк.
+        Returns:
+            dict: Словарь для JSON отчетов и таблицы dataset_profiles
+        """
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data.update(f_rows=self.f_rows, male_rows=self.male_rows)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Создает профиль из словаря to_dict (лишние ключи игнорируются)"""
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+    @classmethod
+    def from_preset(cls, preset, **overrides):
+        """
+        Создает профиль из заготовки PROFILES с переопределенными параметрами.
+        Args:
+            preset: Имя заготовки
+            overrides: Параметры, заменяющие значения заготовки
+        Returns:
+            DatasetProfile: Профиль
+        """
+        if preset not in PROFILES:
+            raise ValueError(f"Неизвестный профиль {preset}, доступные: {', '.join(PROFILES)}")
+        return cls(**{"name": preset, **PROFILES[preset], **overrides})
+
+
+# Заготовки профилей: от небольшого набора для быстрых проверок до 100 миллионов строк
+PROFILES = {
+    "small": {"rows": 10000, "surnames": 100, "f_surnames": 10, "male_names": 20, "female_names": 20,
+              "middle_names": 20, "f_selectivity": 0.01, "batch_size": 10000},
+    "default": {"rows": 1000000},
+    "skewed": {"rows": 1000000, "surnames": 10000, "zipf": 1.1, "f_selectivity": 0.01},
+    "large": {"rows": 10000000, "surnames": 20000, "f_surnames": 500, "male_names": 1000,
+              "female_names": 1000, "middle_names": 1000, "zipf": 1.0, "f_selectivity": 0.005},
+    "huge": {"rows": 100000000, "surnames": 50000, "f_surnames": 2000, "male_names": 2000,
+             "female_names": 2000, "middle_names": 2000, "zipf": 1.0, "f_selectivity": 0.005,
+             "batch_size": 250000},
+}
+
+
+def synthetic_names(count, *, initials, rng):
+    """
+    Генерирует уникальные имена из слогов.
+    Args:
+        count: Количество имен
+        initials: Строка допустимых первых букв
+        rng: Экземпляр random.Random
+    Returns:
+        list: Имена с заглавной буквы; длина растет, только когда короткие сочетания заканчиваются
+    """
+    names = []
+    seen = set()
+    syllables = 1
+    attempts = 0
+    while len(names) < count:
+        # Если короткие сочетания заканчиваются, имена удлиняются
+        attempts += 1
+        if attempts > 20 * count and syllables < 6:
+            syllables += 1
+            attempts = 0
+        name = rng.choice(initials) + "".join(
+            rng.choice(VOWELS) + rng.choice(CONSONANTS) for _ in range(rng.randint(1, 2) + syllables - 1)
+        )
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def zipf_weights(count, exponent):
+    """
+    Возвращает вероятности Zipf-распределения для пула заданного размера.
+    Args:
+        count: Размер пула
+        exponent: Показатель распределения; 0 - равномерное распределение
+    Returns:
+        numpy.ndarray: Вероятности, в сумме равные 1
+    """
+    weights = np.arange(1, count + 1, dtype=np.float64) ** -exponent
+    return weights / weights.sum()
+
+
+class DatasetGenerator:
+    """
+    Генератор строк сотрудников по профилю
+    """
+
+    def __init__(self, profile):
+        """
+        Args:
+            profile: Объект DatasetProfile
+        """
+        if np is None:
+            raise RuntimeError("Для генерации по профилю требуется NumPy")
+
+        self.profile = profile
+        # Пулы имен зависят только от seed, поэтому одинаковы во всех процессах
+        rng = random.Random(f"{profile.seed}-pools")
+        self.surnames = synthetic_names(profile.surnames, initials=NON_F_INITIALS, rng=rng)
+        self.f_surnames = synthetic_names(profile.f_surnames, initials="F", rng=rng)
+        self.male_names = synthetic_names(profile.male_names, initials=NON_F_INITIALS + "F", rng=rng)
+        self.female_names = synthetic_names(profile.female_names, initials=NON_F_INITIALS + "F", rng=rng)
+        self.middle_names = synthetic_names(profile.middle_names, initials=NON_F_INITIALS + "F", rng=rng)
+        self.surname_weights = zipf_weights(profile.surnames, profile.zipf)
+        self.f_surname_weights = zipf_weights(profile.f_surnames, profile.zipf)
+
+    @property
+    def batch_count(self):
+        """Количество партий в наборе данных"""
+        return -(-self.profile.rows // self.profile.batch_size)
+
+    def batch_bounds(self, index):
+        """Возвращает смещение и размер партии с номером index"""
+        start = index * self.profile.batch_size
+        return start, min(self.profile.batch_size, self.profile.rows - start)
+
+    def batch_counts(self, index):
+        """
+        Считает количество мужчин и мужчин с фамилией на 'F' в партии.
+        Строки распределяются пропорционально смещению партии,
+        поэтому в сумме по всем партиям количества совпадают с профилем точно.
+        Returns:
+            tuple: (размер партии, мужчин, мужчин на 'F')
+        """
+        start, size = self.batch_bounds(index)
+        rows = self.profile.rows
+
+        def share(total):
+            return (start + size) * total // rows - start * total // rows
+
+        return size, share(self.profile.male_rows), share(self.profile.f_rows)
+
+    def generate_batch(self, index):
+        """
+        Генерирует партию с номером index.
+        Returns:
+            dict: Списки full_name, birth_date (строки YYYY-MM-DD) и gender
+        """
+        size, males, f_males = self.batch_counts(index)
+        rng = np.random.default_rng([self.profile.seed, index])
+
+        # 0 - мужчина с фамилией на 'F', 1 - остальные мужчины, 2 - женщины
+        kinds = np.repeat(np.array([0, 1, 2], dtype=np.int8), [f_males, males - f_males, size - males])
+        rng.shuffle(kinds)
+        is_male = kinds < 2
+        is_f = kinds == 0
+
+        surname_index = rng.choice(len(self.surnames), size=size, p=self.surname_weights)
+        f_surname_index = rng.choice(len(self.f_surnames), size=size, p=self.f_surname_weights)
+        male_index = rng.integers(0, len(self.male_names), size=size)
+        female_index = rng.integers(0, len(self.female_names), size=size)
+        middle_index = rng.integers(0, len(self.middle_names), size=size)
+
+        surnames, f_surnames = self.surnames, self.f_surnames
+        male_names, female_names, middle_names = self.male_names, self.female_names, self.middle_names
+        full_names = [
+            f"{f_surnames[f_i] if f else surnames[s_i]} {male_names[m_i] if male else female_names[w_i]} "
+            f"{middle_names[mid_i]}"
+            for f, male, s_i, f_i, m_i, w_i, mid_i in zip(
+                is_f.tolist(), is_male.tolist(), surname_index.tolist(), f_surname_index.tolist(),
+                male_index.tolist(), female_index.tolist(), middle_index.tolist())
+        ]
+
+        years = rng.integers(1900, 2026, size=size)
+        months = rng.integers(1, 13, size=size)
+        days = rng.integers(1, 29, size=size)
+        birth_dates = ((years - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+                       + (months - 1)).astype("datetime64[D]") + (days - 1)
+
+        return {
+            "full_name": full_names,
+            "birth_date": birth_dates.astype("U10").tolist(),
+            "gender": np.where(is_male, "Male", "Female").tolist(),
+        }
+
+    @staticmethod
+    def batch_to_copy_buffer(batch):
+        """
+        Собирает партию в байтовый буфер текстового формата COPY.
+        Returns:
+            io.BytesIO: Буфер, готовый для передачи в COPY FROM STDIN
+        """
+        buffer = io.BytesIO()
+        buffer.write("".join(
+            f"{full_name}\t{birth_date}\t{gender}\n"
+            for full_name, birth_date, gender in zip(batch["full_name"], batch["birth_date"], batch["gender"])
+        ).encode())
+        buffer.seek(0)
+        return buffer
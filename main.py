@@ -1,27 +1,42 @@
-import psycopg2
-from config import host, user, password, db_name
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from config import host, user, password, db_name, pool_min_size, pool_max_size, stream_chunk_size
+from config import query_cache_enabled, query_cache_max_entries, query_cache_ttl, query_cache_max_bytes
+from config import import_chunk_size
+from config import log_level, slow_query_threshold, slow_query_log, metrics_file
+from config import async_pool_max_size, async_concurrency
+from async_db import AsyncDatabase, load_test
+from benchmark import BenchmarkRunner, Scenario, plan_indexes, plan_scans, register_scenario
+from cache import MISS, QueryCache
+from dataset import DatasetGenerator, DatasetProfile, PROFILES
+from metrics import QueryMetrics, Timer
+from prefix_index import PrefixIndex
+from contextlib import contextmanager, redirect_stdout
 from datetime import datetime, date
+from itertools import count, islice
+from multiprocessing import Pool
+import asyncio
+import base64
+import csv
+import io
+import json
+import logging
+import os
 import random
+import re
+import shlex
+import socketserver
+import stat
+import sys
 import time
+import weakref
 
+try:
+    import numpy as np
+except ImportError:  # Без NumPy используется построчный генератор на random
+    np = None
 
-def benchmark(func):
-    """
-    Декоратор для измерения времени выполнения функции.
-    Args:
-        func: Функция, время выполнения которой измеряется
-
-    Returns:
-        wrapper: Обертка, которая запускает функцию и выводит время выполнения
-    """
-    def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        execution_time = time.time() - start
-        print(f'[*] Время выполнения: {execution_time:.6f} секунд.')
-        return result
-
-    return wrapper
+logger = logging.getLogger(__name__)
 
 
 class Database:
@@ -29,30 +44,140 @@ class Database:
     Класс для работы с базой данных PostgreSQL
     Предоставляет методы для соединения с базой данных
     выполнения запросов и управления таблицами
+
+    Соединения берутся из общего для всех экземпляров пула,
+    поэтому повторные запросы не платят за установку соединения.
     """
+    _pool = None
+    _pool_pid = None
+    _inherited_pools = []
+    _cursor_ids = count(1)  # Счетчик для уникальных имен серверных курсоров
+    # Подготовленные выражения: имя -> (SQL с $1, $2..., типы параметров)
+    statements = {}
+    # Какие выражения уже подготовлены на каждом соединении пула
+    _prepared = weakref.WeakKeyDictionary()
+    values_page_size = 1000  # Количество строк в одном INSERT ... VALUES
+    # Выражения, которые не меняют результаты SELECT и поэтому не сбрасывают кеш
+    CACHE_SAFE_STATEMENT = re.compile(
+        r"\s*(?:CREATE\s+(?:UNIQUE\s+)?INDEX|DROP\s+INDEX|REINDEX|ANALYZE|VACUUM|SET|RESET|PREPARE|DEALLOCATE)\b",
+        re.IGNORECASE)
+    # Общий кеш результатов SELECT; None - кеширование выключено
+    cache = QueryCache(
+        max_entries=query_cache_max_entries, ttl=query_cache_ttl, max_bytes=query_cache_max_bytes
+    ) if query_cache_enabled else None
+    # Гистограммы времени по этапам, счетчики строк и лог медленных запросов
+    metrics = QueryMetrics(slow_query_threshold=slow_query_threshold, slow_query_log=slow_query_log)
+
     def __init__(self):
         self.connection = None
 
-    def connect(self):
-        #Устанавливаем соединение с базой данных
-        try:
-            self.connection = psycopg2.connect(
+    @classmethod
+    def init_pool(cls, *, min_size=pool_min_size, max_size=pool_max_size):
+        """
+        Создает общий пул соединений, если он еще не создан в текущем процессе.
+        Args:
+            min_size: Количество соединений, открываемых сразу при создании пула
+            max_size: Максимальное количество одновременно открытых соединений
+        Returns:
+            ThreadedConnectionPool: Пул соединений
+        """
+        # После fork дочерний процесс не должен использовать сокеты родителя
+        if cls._pool is not None and cls._pool_pid != os.getpid():
+            # Храним ссылку, чтобы сборщик мусора не закрыл соединения родителя
+            cls._inherited_pools.append(cls._pool)
+            cls._pool = None
+        if cls._pool is None:
+            cls._pool = ThreadedConnectionPool(
+                min_size, max_size,
                 host=host, user=user, password=password, database=db_name
             )
-            print("PostgreSQL подключение установлено")
+            cls._pool_pid = os.getpid()
+            logger.info(f"PostgreSQL пул соединений создан ({min_size}-{max_size})")
+        return cls._pool
+
+    @classmethod
+    def close_pool(cls):
+        """Закрывает все соединения пула"""
+        if cls._pool is not None and cls._pool_pid == os.getpid():
+            cls._pool.closeall()
+            logger.info("PostgreSQL пул соединений закрыт")
+        cls._pool = None
+        cls._pool_pid = None
+
+    @classmethod
+    def enable_cache(cls, *, max_entries=query_cache_max_entries, ttl=query_cache_ttl,
+                     max_bytes=query_cache_max_bytes):
+        """Включает кеш результатов запросов для всех экземпляров Database"""
+        cls.cache = QueryCache(max_entries=max_entries, ttl=ttl, max_bytes=max_bytes)
+        return cls.cache
+
+    @classmethod
+    def invalidate_cache(cls):
+        """Сбрасывает кеш результатов после изменения данных"""
+        if cls.cache is not None:
+            cls.cache.invalidate()
+
+    @classmethod
+    def changes_data(cls, query):
+        """
+        Проверяет, может ли запрос изменить результаты SELECT.
+        Построение и удаление индексов, ANALYZE и настройки сессии данные не меняют,
+        поэтому кеш после них сохраняется. Запрос из нескольких выражений считается
+        изменяющим, если таким является хотя бы одно из них.
+        Returns:
+            bool: True, если после запроса кеш нужно сбросить
+        """
+        return any(not cls.CACHE_SAFE_STATEMENT.match(statement)
+                   for statement in query.split(";") if statement.strip())
+
+    def connect(self, phases=None):
+        #Берем соединение из пула
+        #Время ожидания попадает в этапы запроса, а для сессии из нескольких запросов - под меткой "connect"
+        start = time.perf_counter()
+        try:
+            self.connection = self.init_pool().getconn()
+            if phases is not None:
+                phases["connect"] = time.perf_counter() - start
+            else:
+                self.metrics.observe("connect", "connect", time.perf_counter() - start)
             return True
         except Exception as ex:
-            print(f"Ошибка подключения к PostgreSQL: {ex}")
+            logger.error(f"Ошибка подключения к PostgreSQL: {ex}")
             return False
 
     def close(self):
-        #Закрывает соединение с базой данных
+        #Возвращает соединение в пул
         if self.connection:
-            self.connection.close()
-            print("PostgreSQL отключение завершено")
+            self._pool.putconn(self.connection, close=bool(self.connection.closed))
             self.connection = None
 
-    def query_the_database(self, *, query, params=None, fetch=False, ex_many=False):
+    @contextmanager
+    def session(self, phases=None):
+        """
+        Контекстный менеджер для работы с соединением из пула.
+        Вложенные сессии используют уже открытое соединение,
+        поэтому несколько запросов подряд выполняются на одном соединении.
+        Args:
+            phases: Словарь этапов запроса, в который записывается время получения
+                    соединения (0 для уже открытой сессии)
+        Yields:
+            connection: Соединение с базой данных
+        """
+        if self.connection is not None:
+            if phases is not None:
+                phases["connect"] = 0.0
+            yield self.connection
+            return
+
+        if not self.connect(phases):
+            raise ConnectionError("Не удалось получить соединение с PostgreSQL")
+        try:
+            yield self.connection
+        finally:
+            self.close()
+
+    def query_the_database(self, *, query, params=None, fetch=False, ex_many=False, ex_values=False,
+                           use_cache=False, prepare=None):
         """
         Выполняет SQL запрос к базе данных.
         Args:
@@ -60,35 +185,254 @@ class Database:
             params: Параметры SQL запроса, например значения на место placeholder (%s)
             fetch: Параметр, отвечающий за получение и возврат данных из БД
             ex_many: Параметр, отвечающий за внос данных по несколько за раз
+            ex_values: Внос данных многострочным VALUES (execute_values),
+                       запрос должен содержать один placeholder "VALUES %s"
+            use_cache: Брать результат из кеша, если он включен (только при fetch=True).
+                       Запросы без fetch, меняющие данные (см. changes_data), сбрасывают кеш
+            prepare: Имя подготовленного выражения, которое нужно создать на соединении перед запросом
         Returns:
-            list: Результат запроса при fetch=True, иначе None
+            list: Результат запроса при fetch=True, иначе количество измененных строк; None при ошибке
         """
-        self.connect()
         view_rows = None
+        changed_rows = None
+
+        cache = self.cache if fetch and use_cache else None
+        if cache is not None:
+            cache_key = cache.make_key(query, params)
+            cached_rows = cache.get(cache_key)
+            if cached_rows is not MISS:
+                return cached_rows
 
+        if ex_values and params is not None and not isinstance(params, list):
+            params = list(params)  # Количество строк считается по списку значений
+
+        phases = {}
         try:
-            with self.connection.cursor() as cursor:
-                if params:
-                    if ex_many:
-                        cursor.executemany(query, params)
-                    else:
-                        cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-                    if fetch:
-                        view_rows = cursor.fetchall()
+            with self.session(phases) as connection:
+                try:
+                    if prepare:
+                        self.prepare(prepare)
+                    with connection.cursor() as cursor:
+                        with Timer(phases, "execute"):
+                            if params:
+                                if ex_values:
+                                    execute_values(cursor, query, params, page_size=self.values_page_size)
+                                elif ex_many:
+                                    cursor.executemany(query, params)
+                                else:
+                                    cursor.execute(query, params)
+                            else:
+                                cursor.execute(query)
+                        if fetch:
+                            with Timer(phases, "fetch"):
+                                view_rows = cursor.fetchall()
+                        if fetch:
+                            row_count = len(view_rows)
+                        else:
+                            # execute_values выполняет несколько INSERT, rowcount относится только к последнему
+                            row_count = len(params) if ex_values and params else cursor.rowcount
+
+                    with Timer(phases, "commit"):
+                        connection.commit()
+                    logger.debug(f"Выполнен SQL запрос: {query}")
+                    self.metrics.record(query=query, params=None if ex_many or ex_values else params,
+                                        phases=phases, rows=row_count)
+
+                    if cache is not None and view_rows is not None:
+                        cache.put(cache_key, view_rows)
+                    elif not fetch:
+                        if self.changes_data(query):
+                            self.invalidate_cache()
+                        changed_rows = row_count
+
+                except Exception as e:
+                    logger.error(f"Не удалось выполнить SQL запрос: {e}")
+                    connection.rollback()
+                    self.metrics.record(query=query, phases=phases, error=str(e))
+
+        except ConnectionError as e:
+            logger.error(e)
+
+        return view_rows if fetch else changed_rows
+
+    @classmethod
+    def register_statement(cls, name, query, param_types=()):
+        """
+        Регистрирует серверное подготовленное выражение.
+        Выражение создается командой PREPARE один раз на каждом соединении пула
+        при первом вызове execute_prepared.
+        Args:
+            name: Имя выражения
+            query: SQL запрос с параметрами $1, $2, ...
+            param_types: Типы параметров PostgreSQL, например ("varchar", "date")
+        """
+        cls.statements[name] = (query.strip().rstrip(";"), tuple(param_types))
 
-            print(f"Выполнен SQL запрос: {query}")
-            self.connection.commit()
+    def prepare(self, name):
+        """
+        Создает подготовленное выражение на текущем соединении, если его там еще нет.
+        Вызывается внутри session().
+        Args:
+            name: Имя зарегистрированного выражения
+        """
+        prepared = self._prepared.setdefault(self.connection, set())
+        if name in prepared:
+            return
 
-        except Exception as e:
-            print(f"Не удалось выполнить SQL запрос: {e}")
-            self.connection.rollback()
+        query, param_types = self.statements[name]
+        types = f" ({', '.join(param_types)})" if param_types else ""
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"PREPARE {name}{types} AS {query}")
+        self.connection.commit()
+        prepared.add(name)
+        logger.debug(f"Подготовлено выражение {name}")
 
-        finally:
-            self.close()
+    @staticmethod
+    def execute_statement(name, params=()):
+        """Возвращает SQL вызова подготовленного выражения: EXECUTE name(%s, ...)"""
+        placeholders = f"({', '.join(['%s'] * len(params))})" if params else ""
+        return f"EXECUTE {name}{placeholders}"
+
+    def execute_prepared(self, *, name, params=(), fetch=False, use_cache=False):
+        """
+        Выполняет подготовленное выражение по имени.
+        Сервер не разбирает и не планирует запрос заново при каждом вызове.
+        Args:
+            name: Имя зарегистрированного выражения
+            params: Значения параметров
+            fetch: Получить и вернуть результат
+            use_cache: Брать результат из кеша, если он включен
+        Returns:
+            list: Результат запроса при fetch=True, иначе количество измененных строк; None при ошибке
+        """
+        # PREPARE выполняется в той же сессии, что и EXECUTE, поэтому время получения
+        # соединения учитывается в этапах самого запроса
+        return self.query_the_database(
+            query=self.execute_statement(name, params), params=params or None,
+            fetch=fetch, use_cache=use_cache, prepare=name
+        )
+
+    def stream_query(self, *, query, params=None, chunk_size=stream_chunk_size):
+        """
+        Выполняет SELECT через именованный (серверный) курсор и отдает результат частями.
+        Клиент держит в памяти не больше одной части, первая часть доступна
+        сразу, не дожидаясь загрузки всего результата.
+        Args:
+            query: Строка SQL запроса
+            params: Параметры SQL запроса
+            chunk_size: Количество строк, получаемых с сервера за один раз
+        Yields:
+            list: Очередная часть строк результата
+        """
+        phases = {}
+        row_count = 0
+        try:
+            with self.session(phases) as connection:
+                try:
+                    with connection.cursor(name=f"stream_{next(self._cursor_ids)}") as cursor:
+                        cursor.itersize = chunk_size
+                        with Timer(phases, "execute"):
+                            cursor.execute(query, params)
+                        logger.debug(f"Выполнен SQL запрос: {query}")
+                        while True:
+                            # Время обработки строк вызывающим кодом в fetch не попадает
+                            with Timer(phases, "fetch"):
+                                rows = cursor.fetchmany(chunk_size)
+                            if not rows:
+                                break
+                            row_count += len(rows)
+                            yield rows
+                    with Timer(phases, "commit"):
+                        connection.commit()
+                    self.metrics.record(query=query, params=params, phases=phases, rows=row_count)
+
+                except GeneratorExit:
+                    # Чтение прервано вызывающим кодом - закрываем транзакцию курсора
+                    connection.rollback()
+                    self.metrics.record(query=query, params=params, phases=phases, rows=row_count)
+                    raise
+
+                except Exception as e:
+                    logger.error(f"Не удалось выполнить SQL запрос: {e}")
+                    connection.rollback()
+                    self.metrics.record(query=query, params=params, phases=phases, error=str(e))
+
+        except ConnectionError as e:
+            logger.error(e)
+
+    def copy_from(self, *, query, file):
+        """
+        Загружает данные командой COPY ... FROM STDIN.
+        Args:
+            query: Строка SQL запроса COPY
+            file: Файлоподобный объект с данными в формате, указанном в COPY
+        Returns:
+            int: Количество загруженных строк или None при ошибке
+        """
+        copied = None
+        phases = {}
+
+        try:
+            with self.session(phases) as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        with Timer(phases, "execute"):
+                            cursor.copy_expert(query, file)
+                        copied = cursor.rowcount
+
+                    with Timer(phases, "commit"):
+                        connection.commit()
+                    logger.debug(f"Выполнен SQL запрос: {query}")
+                    self.metrics.record(query=query, phases=phases, rows=copied)
+                    self.invalidate_cache()
+
+                except Exception as e:
+                    logger.error(f"Не удалось выполнить COPY: {e}")
+                    connection.rollback()
+                    self.metrics.record(query=query, phases=phases, error=str(e))
+                    copied = None
+
+        except ConnectionError as e:
+            logger.error(e)
+
+        return copied
+
+    def copy_to(self, *, query, file):
+        """
+        Выгружает данные командой COPY ... TO STDOUT прямо в файл.
+        psycopg2 передает данные частями, поэтому память не зависит от объема выгрузки.
+        Args:
+            query: Строка SQL запроса COPY
+            file: Файлоподобный объект, открытый на запись (байтовый или текстовый)
+        Returns:
+            int: Количество выгруженных строк или None при ошибке
+        """
+        copied = None
+        phases = {}
+
+        try:
+            with self.session(phases) as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        with Timer(phases, "execute"):
+                            cursor.copy_expert(query, file)
+                        copied = cursor.rowcount
 
-        return view_rows
+                    with Timer(phases, "commit"):
+                        connection.commit()
+                    logger.debug(f"Выполнен SQL запрос: {query}")
+                    self.metrics.record(query=query, phases=phases, rows=copied)
+
+                except Exception as e:
+                    logger.error(f"Не удалось выполнить COPY: {e}")
+                    connection.rollback()
+                    self.metrics.record(query=query, phases=phases, error=str(e))
+                    copied = None
+
+        except ConnectionError as e:
+            logger.error(e)
+
+        return copied
 
     def create_table(self):
         """Создает таблицу сотрудников если она не существует"""
@@ -102,14 +446,19 @@ class Database:
         """
         self.query_the_database(query=query)
 
-    def clear_table(self):
-        """Очищает таблицу сотрудников"""
-        query = "DELETE FROM employees;"
+    def clear_table(self, *, truncate=False):
+        """
+        Очищает таблицу сотрудников
+        Args:
+            truncate: Использовать TRUNCATE вместо DELETE: не оставляет мертвых строк
+                      и раздутых индексов, но блокирует таблицу целиком
+        """
+        query = "TRUNCATE employees;" if truncate else "DELETE FROM employees;"
         try:
             self.query_the_database(query=query)
-            print("Таблица успешно очищена")
+            logger.info("Таблица успешно очищена")
         except Exception as e:
-            print(f"Ошибка при очистке таблицы: {e}")
+            logger.error(f"Ошибка при очистке таблицы: {e}")
 
     def create_index(self):
         """Создает индекс для оптимизации поиска по полям gender и full_name"""
@@ -117,13 +466,148 @@ class Database:
         CREATE INDEX IF NOT EXISTS idx_gender_fullname ON employees (gender, full_name);
         """
         self.query_the_database(query=query)
-        print("Создан индекс idx_gender_fullname на полях gender, full_name")
+        logger.info("Создан индекс idx_gender_fullname на полях gender, full_name")
 
     def drop_index(self):
         """Удаляет индекс для сравнения производительности"""
         query = "DROP INDEX IF EXISTS idx_gender_fullname;"
         self.query_the_database(query=query)
-        print("Удален индекс idx_gender_fullname")
+        logger.info("Удален индекс idx_gender_fullname")
+
+    def create_pagination_index(self):
+        """Создает индекс по (full_name, id) для постраничного просмотра по ключу"""
+        query = "CREATE INDEX IF NOT EXISTS idx_fullname_id ON employees (full_name, id);"
+        self.query_the_database(query=query)
+
+    def drop_pagination_index(self):
+        """Удаляет индекс постраничного просмотра (при collation "C" он подходит и для поиска на 'F')"""
+        query = "DROP INDEX IF EXISTS idx_fullname_id;"
+        self.query_the_database(query=query)
+
+    def index_exists(self, name):
+        """Проверяет, существует ли индекс с указанным именем"""
+        rows = self.query_the_database(query="SELECT to_regclass(%s) IS NOT NULL;", params=(name,), fetch=True)
+        return bool(rows and rows[0][0])
+
+    def index_size(self, name):
+        """Возвращает размер индекса в байтах или None, если индекса нет"""
+        rows = self.query_the_database(
+            query="SELECT pg_relation_size(to_regclass(%s));", params=(name,), fetch=True
+        )
+        return rows[0][0] if rows else None
+
+    def create_profile_table(self):
+        """Создает таблицу сведений о загруженных по профилю наборах данных"""
+        query = """
+            CREATE TABLE IF NOT EXISTS dataset_profiles (
+                id SERIAL PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                params JSONB NOT NULL,
+                rows_loaded BIGINT NOT NULL,
+                load_seconds DOUBLE PRECISION NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT now()
+            );
+            -- Состояние employees сразу после загрузки: по нему видно, что данные с тех пор заменены
+            ALTER TABLE dataset_profiles
+                ADD COLUMN IF NOT EXISTS min_id BIGINT,
+                ADD COLUMN IF NOT EXISTS max_id BIGINT,
+                ADD COLUMN IF NOT EXISTS table_rows BIGINT;
+        """
+        self.query_the_database(query=query)
+
+    # Диапазон id и количество строк employees. Последовательность id не сбрасывается,
+    # поэтому любая загрузка, очистка или подмена таблицы меняет хотя бы одно из значений
+    EMPLOYEES_STATE_QUERY = "SELECT coalesce(min(id), 0), coalesce(max(id), 0), count(*) FROM employees;"
+
+    def record_dataset_profile(self, *, profile, rows_loaded, load_seconds):
+        """
+        Сохраняет профиль загруженного набора данных вместе с текущим состоянием таблицы employees.
+        Args:
+            profile: Объект DatasetProfile
+            rows_loaded: Количество загруженных строк
+            load_seconds: Время загрузки в секундах
+        """
+        self.create_profile_table()
+        rows = self.query_the_database(query=self.EMPLOYEES_STATE_QUERY, fetch=True)
+        min_id, max_id, table_rows = rows[0] if rows else (None, None, None)
+        self.query_the_database(
+            query="INSERT INTO dataset_profiles (name, params, rows_loaded, load_seconds, min_id, max_id, table_rows) "
+                  "VALUES (%s, %s::jsonb, %s, %s, %s, %s, %s);",
+            params=(profile.name, json.dumps(profile.to_dict()), rows_loaded, load_seconds,
+                    min_id, max_id, table_rows),
+        )
+
+    def latest_dataset_profile(self):
+        """
+        Возвращает последний загруженный профиль набора данных, если таблица employees с тех пор не менялась.
+        Данные, замененные другим способом (режимы 2, 4, 10, 15, очистка таблицы), профилю уже не соответствуют.
+        Returns:
+            dict: Имя, параметры, количество строк, время загрузки и дата или None,
+                  если профилей нет или данные в таблице уже другие
+        """
+        rows = self.query_the_database(query="SELECT to_regclass('dataset_profiles') IS NOT NULL;", fetch=True)
+        if not rows or not rows[0][0]:
+            return None
+        # Столбцы состояния читаются через to_jsonb: в таблице, созданной до их появления, их может не быть
+        rows = self.query_the_database(
+            query="SELECT name, params, rows_loaded, load_seconds, created_at, to_jsonb(p) "
+                  "FROM dataset_profiles p ORDER BY id DESC LIMIT 1;",
+            fetch=True,
+        )
+        if not rows:
+            return None
+        name, params, rows_loaded, load_seconds, created_at, row = rows[0]
+        recorded_state = tuple(row.get(column) for column in ("min_id", "max_id", "table_rows"))
+        current_state = self.query_the_database(query=self.EMPLOYEES_STATE_QUERY, fetch=True)
+        if not current_state or tuple(current_state[0]) != recorded_state:
+            return None
+        return {"name": name, "params": params, "rows_loaded": rows_loaded,
+                "load_seconds": load_seconds, "created_at": created_at.isoformat(timespec="seconds")}
+
+    def table_indexes(self, table="employees"):
+        """
+        Возвращает вторичные индексы таблицы (без первичного ключа).
+        Returns:
+            list: Кортежи (имя индекса, определение CREATE INDEX)
+        """
+        return self.query_the_database(
+            query="SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x "
+                  "JOIN pg_class i ON i.oid = x.indexrelid "
+                  "WHERE x.indrelid = to_regclass(%s) AND NOT x.indisprimary ORDER BY i.relname;",
+            params=(table,), fetch=True,
+        ) or []
+
+    def table_rows(self, table):
+        """Возвращает количество строк в таблице или None, если таблицы нет"""
+        rows = self.query_the_database(query="SELECT to_regclass(%s) IS NOT NULL;", params=(table,), fetch=True)
+        if not rows or not rows[0][0]:
+            return None
+        rows = self.query_the_database(query=f"SELECT count(*) FROM {table};", fetch=True)
+        return rows[0][0] if rows else None
+
+    def run_maintenance(self, *, query):
+        """
+        Выполняет служебную команду вне транзакции (VACUUM, CREATE INDEX CONCURRENTLY и т.п.).
+        Args:
+            query: Строка SQL запроса
+        """
+        phases = {}
+        try:
+            with self.session(phases) as connection:
+                connection.autocommit = True
+                try:
+                    with connection.cursor() as cursor:
+                        with Timer(phases, "execute"):
+                            cursor.execute(query)
+                    logger.debug(f"Выполнен SQL запрос: {query}")
+                    self.metrics.record(query=query, phases=phases)
+                except Exception as e:
+                    logger.error(f"Не удалось выполнить SQL запрос: {e}")
+                    self.metrics.record(query=query, phases=phases, error=str(e))
+                finally:
+                    connection.autocommit = False
+        except ConnectionError as e:
+            logger.error(e)
 
 
 class Employee:
@@ -133,6 +617,7 @@ class Employee:
     Предоставляет методы для создания, валидации и добавления
     сотрудников в базу данных.
     """
+    FULL_NAME_MAX_LENGTH = 100  # Размер столбца full_name VARCHAR(100)
 
     def __init__(self, *, full_name, birth_date, gender):
         """
@@ -167,62 +652,196 @@ class Employee:
         Валидации:
             - Должно состоять из 3 слов
             - Должно содержать только английские буквы
+            - После нормализации пробелов не длиннее FULL_NAME_MAX_LENGTH символов
+        """
+        value, error = self.validate_full_name(full_name)
+        if error:
+            print(error)
+            return
+
+        self.__full_name = value
+
+    @birth_date.setter
+    def birth_date(self, birth_date):
+        """Валидирует и устанавливает дату рождения"""
+        value, error = self.validate_birth_date(birth_date)
+        if error:
+            print(error)
+            return
+
+        self.__birth_date = value
+
+    @gender.setter
+    def gender(self, gender):
+        """Валидирует и устанавливает пол"""
+        value, error = self.validate_gender(gender)
+        if error:
+            print(error)
+            return
+
+        self.__gender = value
+
+    @staticmethod
+    def validate_full_name(full_name):
+        """
+        Проверяет полное имя по правилам сеттера full_name.
+        Returns:
+            tuple: (нормализованное ФИО, None) или (None, текст ошибки)
         """
         valid_chars = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
 
         if full_name is None:
-            print("ФИО не заполнено! (None)")
-            return
+            return None, "ФИО не заполнено! (None)"
 
-        words = full_name.split()
+        words = str(full_name).split()
         if len(words) != 3:
-            print("ФИО должно состоять ровно из трех слов (Фамилия Имя Отчество)")
-            return
+            return None, "ФИО должно состоять ровно из трех слов (Фамилия Имя Отчество)"
 
         for word in words:
             if not all(char in valid_chars for char in word):
-                print("ФИО должно содержать только английские буквы")
-                return
+                return None, "ФИО должно содержать только английские буквы"
 
-        self.__full_name = full_name.title()
+        # Слова разделяются одним пробелом, как в остальных строках таблицы
+        full_name = " ".join(words).title()
+        if len(full_name) > Employee.FULL_NAME_MAX_LENGTH:
+            return None, f"ФИО не должно быть длиннее {Employee.FULL_NAME_MAX_LENGTH} символов"
 
-    @birth_date.setter
-    def birth_date(self, birth_date):
-        """Валидирует и устанавливает дату рождения"""
+        return full_name, None
+
+    @staticmethod
+    def validate_birth_date(birth_date):
+        """
+        Проверяет дату рождения по правилам сеттера birth_date.
+        Returns:
+            tuple: (date, None) или (None, текст ошибки)
+        """
         if birth_date is None:
-            print("Дата рождения не заполнена! (None)")
-            return
+            return None, "Дата рождения не заполнена! (None)"
 
         try:
-            self.__birth_date = datetime.strptime(birth_date, "%Y-%m-%d").date()
-        except ValueError:
-            print("Формат даты должен быть год-месяц-день (YYYY-MM-DD)")
+            return datetime.strptime(birth_date, "%Y-%m-%d").date(), None
+        except (TypeError, ValueError):
+            return None, "Формат даты должен быть год-месяц-день (YYYY-MM-DD)"
 
-    @gender.setter
-    def gender(self, gender):
-        """Валидирует и устанавливает пол"""
+    @staticmethod
+    def validate_gender(gender):
+        """
+        Проверяет пол по правилам сеттера gender.
+        Returns:
+            tuple: (нормализованный пол, None) или (None, текст ошибки)
+        """
         if gender is None:
-            print("Пол не заполнен! (None)")
-            return
+            return None, "Пол не заполнен! (None)"
 
-        gender = gender.title()
+        gender = str(gender).title()
         if gender not in ["Male", "Female"]:
-            print("Пол записывается только значениями 'Male' и 'Female'")
-            return
+            return None, "Пол записывается только значениями 'Male' и 'Female'"
+
+        return gender, None
+
+    # Коды ошибок validate_many; несколько ошибок в строке объединяются побитовым ИЛИ
+    VALID = 0
+    ERR_NAME_EMPTY = 1
+    ERR_NAME_WORDS = 2
+    ERR_NAME_CHARS = 4
+    ERR_DATE_EMPTY = 8
+    ERR_DATE_FORMAT = 16
+    ERR_GENDER_EMPTY = 32
+    ERR_GENDER_VALUE = 64
+    ERR_NAME_LENGTH = 128
+    ERROR_MESSAGES = {
+        ERR_NAME_EMPTY: "ФИО не заполнено! (None)",
+        ERR_NAME_WORDS: "ФИО должно состоять ровно из трех слов (Фамилия Имя Отчество)",
+        ERR_NAME_CHARS: "ФИО должно содержать только английские буквы",
+        ERR_DATE_EMPTY: "Дата рождения не заполнена! (None)",
+        ERR_DATE_FORMAT: "Формат даты должен быть год-месяц-день (YYYY-MM-DD)",
+        ERR_GENDER_EMPTY: "Пол не заполнен! (None)",
+        ERR_GENDER_VALUE: "Пол записывается только значениями 'Male' и 'Female'",
+        ERR_NAME_LENGTH: f"ФИО не должно быть длиннее {FULL_NAME_MAX_LENGTH} символов",
+    }
+    _ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+    @staticmethod
+    def validate_many(*, full_names, birth_dates, genders):
+        """
+        Проверяет столбцы значений по правилам сеттеров без создания объектов Employee.
+        Ничего не печатает: для каждой строки возвращается код ошибки (0 - строка корректна).
+        Args:
+            full_names: Последовательность ФИО
+            birth_dates: Последовательность дат рождения в формате YYYY-MM-DD
+            genders: Последовательность значений пола
+        Returns:
+            tuple: (список EmployeeRecord или None для некорректных строк, список кодов ошибок)
+        """
+        cls = Employee
+        iso_date = cls._ISO_DATE.fullmatch
+        from_iso = date.fromisoformat
+        strptime = datetime.strptime
+        genders_allowed = {"Male", "Female"}
+        max_length = cls.FULL_NAME_MAX_LENGTH
+        records = []
+        codes = []
+
+        for full_name, birth_date, gender in zip(full_names, birth_dates, genders):
+            code = 0
+
+            if full_name is None:
+                code |= cls.ERR_NAME_EMPTY
+            else:
+                words = str(full_name).split()
+                if len(words) != 3:
+                    code |= cls.ERR_NAME_WORDS
+                else:
+                    letters = "".join(words)
+                    if not (letters.isascii() and letters.isalpha()):
+                        code |= cls.ERR_NAME_CHARS
+                    full_name = " ".join(words)
+                    if len(full_name) > max_length:
+                        code |= cls.ERR_NAME_LENGTH
+
+            if birth_date is None:
+                code |= cls.ERR_DATE_EMPTY
+            else:
+                try:
+                    # Быстрый путь для YYYY-MM-DD, остальные варианты проверяет strptime как сеттер
+                    if iso_date(birth_date):
+                        birth_date = from_iso(birth_date)
+                    else:
+                        birth_date = strptime(birth_date, "%Y-%m-%d").date()
+                except (TypeError, ValueError):
+                    code |= cls.ERR_DATE_FORMAT
+
+            if gender is None:
+                code |= cls.ERR_GENDER_EMPTY
+            else:
+                gender = str(gender).title()  # Как validate_gender: нестроковое значение - ошибка, а не исключение
+                if gender not in genders_allowed:
+                    code |= cls.ERR_GENDER_VALUE
+
+            codes.append(code)
+            records.append(None if code else EmployeeRecord(full_name.title(), birth_date, gender))
 
-        self.__gender = gender
+        return records, codes
+
+    @classmethod
+    def describe_errors(cls, code):
+        """
+        Расшифровывает код ошибки validate_many.
+        Returns:
+            list: Тексты ошибок, как в сеттерах
+        """
+        return [message for flag, message in cls.ERROR_MESSAGES.items() if code & flag]
 
     def add_employee(self):
-        """Добавляет сотрудника в базу данных"""
+        """Добавляет сотрудника в базу данных через подготовленное выражение insert_employee"""
         try:
-            query = """
-            INSERT INTO employees (full_name, birth_date, gender) 
-            VALUES (%s, %s, %s)
-            """
-            self.database.query_the_database(
-                query=query,
+            added = self.database.execute_prepared(
+                name="insert_employee",
                 params=(self.full_name, self.birth_date, self.gender)
             )
+            if added is None:
+                print(f"Не удалось добавить сотрудника {self.full_name}")
+                return
             print(f"Сотрудник {self.full_name} успешно добавлен")
         except Exception:
             print(f"Не удалось добавить сотрудника, ошибка в введенных данных")
@@ -244,220 +863,2022 @@ class Employee:
             print(f"Не удалось посчитать возраст: {e}")
             return None
 
+    @staticmethod
+    def calculate_ages(*, birth_dates, today=None):
+        """
+        Вычисляет возраст для целой партии дат рождения за одну операцию.
+        Массив NumPy datetime64 обрабатывается векторно; для списка объектов date
+        используется один проход без повторного вызова datetime.now()
+        (преобразование списка date в datetime64 дороже самого расчета).
+        Args:
+            birth_dates: Последовательность дат рождения (date) или массив datetime64
+            today: Дата, на которую считается возраст; определяется один раз на партию
+        Returns:
+            list: Возраст в полных годах для каждой даты
+        """
+        today = today or datetime.now().date()
+
+        if np is None or not isinstance(birth_dates, np.ndarray):
+            today_md = (today.month, today.day)
+            return [today.year - d.year - ((d.month, d.day) > today_md) for d in birth_dates]
+
+        dates = birth_dates.astype("datetime64[D]")
+        month_start = dates.astype("datetime64[M]")
+        years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+        months = month_start.astype(np.int64) % 12 + 1
+        days = (dates - month_start).astype(np.int64) + 1
+        not_yet = (months > today.month) | ((months == today.month) & (days > today.day))
+        return (today.year - years - not_yet).tolist()
+
+
+Database.register_statement(
+    "insert_employee",
+    "INSERT INTO employees (full_name, birth_date, gender) VALUES ($1, $2, $3)",
+    ("varchar", "date", "varchar"),
+)
+
+
+class EmployeeRecord:
+    """
+    Легковесная запись сотрудника для массовой обработки.
+    В отличие от Employee не проверяет значения при присваивании
+    и не создает подключение к базе данных.
+    """
+    __slots__ = ("full_name", "birth_date", "gender")
+
+    def __init__(self, full_name, birth_date, gender):
+        self.full_name = full_name
+        self.birth_date = birth_date
+        self.gender = gender
+
+    def __repr__(self):
+        return f"EmployeeRecord({self.full_name!r}, {self.birth_date!r}, {self.gender!r})"
+
+    def as_tuple(self):
+        """Возвращает запись в виде кортежа (full_name, birth_date, gender) для загрузки в БД"""
+        return self.full_name, self.birth_date, self.gender
+
 
 class EmployeeManager:
     """Класс для управления массовыми операциями с сотрудниками"""
-    def __init__(self):
+    SURNAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+                "Martinez"]
+    NAMES_MALE = ["James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph", "Thomas", "Charles"]
+    NAMES_FEMALE = ["Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica", "Sarah",
+                    "Karen"]
+    LASTNAMES = ["Edward", "Alexander", "Christopher", "Daniel", "Matthew", "Anthony", "Brian", "Kevin", "Eric",
+                 "Ryan"]
+    F_SURNAMES = ["Foster", "Fletcher", "Ferguson", "Fisher", "Finley", "Ford", "Franklin", "Fitzgerald"]
+
+    # Стратегии массовой загрузки: COPY FROM STDIN и многострочный INSERT ... VALUES
+    LOAD_STRATEGIES = ("copy", "values")
+    COPY_QUERY = "COPY {table} (full_name, birth_date, gender) FROM STDIN"
+    VALUES_QUERY = "INSERT INTO {table} (full_name, birth_date, gender) VALUES %s"
+    # Символы, которые в текстовом формате COPY нужно экранировать обратной косой чертой
+    COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+    def __init__(self, *, table="employees"):
+        """
+        Args:
+            table: Таблица, в которую загружаются сотрудники (например, промежуточная при перезагрузке)
+        """
         self.database = Database()
+        self.table = table
+        self.copy_query = self.COPY_QUERY.format(table=table)
+        self.values_query = self.VALUES_QUERY.format(table=table)
 
     @staticmethod
-    def _generate_random_date():
+    def _generate_random_date(rng=random):
         """Генерирует случайную дату рождения"""
-        year = random.randint(1900, 2025)
-        month = random.randint(1, 12)
-        day = random.randint(1, 28)
+        year = rng.randint(1900, 2025)
+        month = rng.randint(1, 12)
+        day = rng.randint(1, 28)
         return date(year, month, day)
 
     @staticmethod
-    def generate_batch_employees(*, batch_size, f_surnames=False):
+    def iter_batch_employees(*, batch_size, f_surnames=False, rng=random):
         """
-        Генерирует партию случайных сотрудников.
+        Лениво генерирует партию случайных сотрудников, не накапливая ее в памяти.
         Args:
             batch_size: Количество генерируемых сотрудников
             f_surnames: Если True, генерирует мужчин с фамилиями на F
-        Returns:
-            list: Список кортежей с данными сотрудников (full_name, birth_date, gender)
+            rng: Генератор случайных чисел (модуль random или экземпляр random.Random)
+        Yields:
+            tuple: Данные сотрудника (full_name, birth_date, gender)
         """
-        surname = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
-                   "Martinez"]
-        name_male = ["James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph", "Thomas", "Charles"]
-        name_female = ["Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica", "Sarah",
-                       "Karen"]
-        lastname = ["Edward", "Alexander", "Christopher", "Daniel", "Matthew", "Anthony", "Brian", "Kevin", "Eric",
-                    "Ryan"]
-        f_surname = ["Foster", "Fletcher", "Ferguson", "Fisher", "Finley", "Ford", "Franklin", "Fitzgerald"]
-
-        batch_data = []
+        cls = EmployeeManager
 
         # Вспомогательная функция для создания сотрудника
         def create_employee(surname_list, name_list, gender):
-            full_name = f"{random.choice(surname_list)} {random.choice(name_list)} {random.choice(lastname)}"
-            birth_date = EmployeeManager._generate_random_date()
+            full_name = f"{rng.choice(surname_list)} {rng.choice(name_list)} {rng.choice(cls.LASTNAMES)}"
+            birth_date = cls._generate_random_date(rng)
             return (full_name, birth_date, gender)
 
         if f_surnames:
             # Генерируем мужчин с фамилией на F
             for _ in range(batch_size):
-                batch_data.append(create_employee(f_surname, name_male, "Male"))
+                yield create_employee(cls.F_SURNAMES, cls.NAMES_MALE, "Male")
         else:
             # Генерируем обычных сотрудников (50/50 мужчин и женщин)
             for _ in range(batch_size // 2):
                 # Мужчина
-                batch_data.append(create_employee(surname, name_male, "Male"))
+                yield create_employee(cls.SURNAMES, cls.NAMES_MALE, "Male")
                 # Женщина
-                batch_data.append(create_employee(surname, name_female, "Female"))
-
-        return batch_data
-
-    def add_one_million_employees(self):
-        """Добавляет миллион сотрудников в базу данных партиями"""
-        total = 1000000
-        batch_size = 100000
-        added = 0
-        regular_employees = total - 100
-
-        try:
-            print(f"Начинаем добавление {total} сотрудников партиями по {batch_size}...")
-
-            # Добавляем обычных сотрудников
-            while added < regular_employees:
-                current_size = min(batch_size, regular_employees - added)
-                print(f"Генерация партии {added + 1}-{added + current_size}...")
-
-                # Используем статический метод из класса Employee
-                batch = EmployeeManager.generate_batch_employees(batch_size=current_size)
-
-                query = "INSERT INTO employees (full_name, birth_date, gender) VALUES (%s, %s, %s)"
-                self.database.query_the_database(query=query, params=batch, ex_many=True)
-
-                added += current_size
-                print(f"Прогресс: {added}/{total} ({added / total * 100:.1f}%)")
-
-            # Добавляем 100 мужчин с фамилией на F
-            print("Добавление 100 мужчин с фамилией на F...")
-            f_batch = EmployeeManager.generate_batch_employees(batch_size=100, f_surnames=True)
-
-            query = "INSERT INTO employees (full_name, birth_date, gender) VALUES (%s, %s, %s)"
-            self.database.query_the_database(query=query, params=f_batch, ex_many=True)
-
-            added += 100
-            print(f"Готово! Всего добавлено: {added}/{total} сотрудников.")
-
-        except Exception as e:
-            print(f"Не удалось добавить сотрудников: {e}")
-
+                yield create_employee(cls.SURNAMES, cls.NAMES_FEMALE, "Female")
+            # При нечетном размере партии добавляем еще одного мужчину
+            if batch_size % 2:
+                yield create_employee(cls.SURNAMES, cls.NAMES_MALE, "Male")
 
-class EmployeeView:
-    """
-    Класс для отображения данных о сотрудниках.
-    Предоставляет методы для получения и отображения данных
-    из таблицы employees.
-    """
-
-    def __init__(self):
-        self.database = Database()
-
-    def get_all_employees(self):
-        """Получает список всех сотрудников из БД"""
-        query = "SELECT * FROM employees ORDER BY full_name;"
-        return self.database.query_the_database(query=query, fetch=True)
-
-    def display_employees_with_age(self):
+    @staticmethod
+    def generate_columns(*, batch_size, f_surnames=False, seed=None, rng=None):
         """
-        Отображает список сотрудников с их возрастом.
-
-        Получает данные из БД, вычисляет возраст каждого сотрудника и
-        выводит информацию в виде форматированной таблицы.
+        Векторно генерирует партию сотрудников в виде массивов NumPy.
+        Все индексы имен, даты и пол выбираются одним вызовом на столбец.
+        Args:
+            batch_size: Количество генерируемых сотрудников
+            f_surnames: Если True, генерирует мужчин с фамилиями на F
+            seed: Начальное значение генератора для воспроизводимых наборов данных
+            rng: Готовый numpy.random.Generator (имеет приоритет над seed)
+        Returns:
+            dict: Массивы full_name, birth_date (datetime64[D]) и gender
         """
-        employees_data = self.get_all_employees()
-        if not employees_data:
-            print("Список сотрудников пуст")
-            return
+        if np is None:
+            raise RuntimeError("Для векторной генерации требуется NumPy")
 
-        # Преобразуем в список списков и добавляем возраст
-        employees_list = []
-        for employee in employees_data:
-            emp_id, full_name, birth_date, gender = employee
-            age = Employee.calculate_age(birth_date=birth_date)
-            employees_list.append([emp_id, full_name, birth_date, age, gender])
+        cls = EmployeeManager
+        rng = rng if rng is not None else np.random.default_rng(seed)
 
-        # Выводим таблицу
-        print("\n{:<5} {:<35} {:<15} {:<8} {:<8}".format(
-            "ID", "ФИО", "Дата рождения", "Возраст", "Пол"))
-        print("-" * 75)
+        if f_surnames:
+            is_male = np.ones(batch_size, dtype=bool)
+            surname_pool = cls.F_SURNAMES
+        else:
+            # Чередование мужчина/женщина, как в iter_batch_employees
+            is_male = np.arange(batch_size) % 2 == 0
+            surname_pool = cls.SURNAMES
+
+        # Все сочетания "Фамилия Имя Отчество" строятся один раз, строки выбираются по индексу
+        male_names = cls._full_name_table(surname_pool, cls.NAMES_MALE)
+        female_names = cls._full_name_table(surname_pool, cls.NAMES_FEMALE)
+        full_names = np.where(
+            is_male,
+            male_names[rng.integers(0, len(male_names), size=batch_size)],
+            female_names[rng.integers(0, len(female_names), size=batch_size)],
+        )
+
+        years = rng.integers(1900, 2026, size=batch_size)
+        months = rng.integers(1, 13, size=batch_size)
+        days = rng.integers(1, 29, size=batch_size)
+        birth_dates = ((years - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+                       + (months - 1)).astype("datetime64[D]") + (days - 1)
+
+        return {
+            "full_name": full_names,
+            "birth_date": birth_dates,
+            "gender": np.where(is_male, "Male", "Female"),
+        }
 
-        for emp in employees_list:
-            print("{:<5} {:<35} {:<15} {:<8} {:<8}".format(
-                emp[0], emp[1], emp[2].strftime("%Y-%m-%d"), emp[3], emp[4]))
+    @staticmethod
+    def _full_name_table(surnames, names):
+        """Возвращает массив всех сочетаний фамилии, имени и отчества"""
+        return np.array([f"{surname} {name} {lastname}"
+                         for surname in surnames for name in names for lastname in EmployeeManager.LASTNAMES])
 
-    @benchmark
-    def find_employee_F_without_index(self):
+    @staticmethod
+    def columns_to_rows(columns):
         """
-        Находим мужчин с фамилией на 'F' без использования индекса
-        Время выполнения измеряется с помощью декоратора benchmark
+        Преобразует столбцы из generate_columns в список кортежей.
         Returns:
-            list: Список найденных сотрудников
-        Примечание: удаление и создание индексов происходит вне классов методами create_index and delete_index
-        """
-        query = """
-        SELECT * FROM employees 
-        WHERE gender = 'Male' AND full_name LIKE 'F%'
-        ORDER BY full_name;
+            list: Список кортежей (full_name, birth_date, gender)
         """
-        return self.database.query_the_database(query=query, fetch=True)
+        return list(zip(columns["full_name"].tolist(), columns["birth_date"].tolist(),
+                        columns["gender"].tolist()))
 
-    @benchmark
-    def find_employee_F_with_index(self):
+    @staticmethod
+    def columns_to_copy_buffer(columns):
         """
-        Находит мужчин с фамилией на 'F' с использованием индекса
-        Выполняет тот же SQL-запрос, что и find_employee_F_without_index,
-        но предполагается, что в таблице создан индекс idx_gender_fullname,
-        что должно ускорить выполнение запроса.
+        Собирает столбцы из generate_columns в байтовый буфер формата COPY.
         Returns:
-            list: Список найденных сотрудников
-        Примечание: удаление и создание индексов происходит вне классов методами create_index and delete_index
+            io.BytesIO: Буфер, готовый для передачи в COPY FROM STDIN
         """
-        query = """
-        SELECT * FROM employees 
-        WHERE gender = 'Male' AND full_name LIKE 'F%'
-        ORDER BY full_name;
+        lines = np.char.add(np.char.add(np.char.add(np.char.add(
+            columns["full_name"], "\t"), columns["birth_date"].astype("U10")), "\t"), columns["gender"])
+        buffer = io.BytesIO()
+        if len(lines):
+            buffer.write("\n".join(lines.tolist()).encode())
+            buffer.write(b"\n")
+        buffer.seek(0)
+        return buffer
+
+    @staticmethod
+    def generate_batch_employees(*, batch_size, f_surnames=False, seed=None):
+        """
+        Генерирует партию случайных сотрудников.
+        Args:
+            batch_size: Количество генерируемых сотрудников
+            f_surnames: Если True, генерирует мужчин с фамилиями на F
+            seed: Начальное значение генератора случайных чисел
+        Returns:
+            list: Список кортежей с данными сотрудников (full_name, birth_date, gender)
         """
-        return self.database.query_the_database(query=query, fetch=True)
+        if np is None:
+            rng = random.Random(seed) if seed is not None else random
+            return list(EmployeeManager.iter_batch_employees(batch_size=batch_size, f_surnames=f_surnames, rng=rng))
 
+        columns = EmployeeManager.generate_columns(batch_size=batch_size, f_surnames=f_surnames, seed=seed)
+        return EmployeeManager.columns_to_rows(columns)
 
-def compare_search_performance():
-    """
-    Сравнивает производительность поиска сотрудников с индексом и без индекса
-    Выполняет один и тот же поисковый запрос дважды:
-    сначала без индекса, затем с индексом
-    Измеряет и сравнивает время выполнения, показывая разницу в производительности
+    @staticmethod
+    def rows_to_copy_buffer(rows):
+        """
+        Записывает строки в буфер в текстовом формате COPY (значения через табуляцию).
+        Обратная косая черта, табуляция и переводы строк в значениях экранируются,
+        иначе COPY разобьет строку на другие поля или строки.
+        Args:
+            rows: Итерируемый объект кортежей (full_name, birth_date, gender)
+        Returns:
+            io.StringIO: Буфер, готовый для передачи в COPY FROM STDIN
+        """
+        buffer = io.StringIO()
+        write = buffer.write
+        escapes = EmployeeManager.COPY_ESCAPES
+        for full_name, birth_date, gender in rows:
+            write(f"{full_name.translate(escapes)}\t{birth_date.isoformat()}\t{gender.translate(escapes)}\n")
+        buffer.seek(0)
+        return buffer
+
+    def load_batch(self, *, rows, strategy="copy"):
+        """
+        Загружает партию сотрудников выбранной стратегией.
+        Args:
+            rows: Итерируемый объект кортежей (full_name, birth_date, gender)
+            strategy: "copy" - COPY FROM STDIN, "values" - многострочный INSERT ... VALUES
+        Returns:
+            int: Количество загруженных строк; None, если партия не загружена
+        """
+        if strategy == "copy":
+            return self.database.copy_from(query=self.copy_query, file=self.rows_to_copy_buffer(rows))
+        elif strategy == "values":
+            return self.database.query_the_database(query=self.values_query, params=rows, ex_values=True)
+        else:
+            raise ValueError(f"Неизвестная стратегия загрузки: {strategy}")
+
+    @staticmethod
+    def make_rng(seed=None):
+        """
+        Создает генератор случайных чисел для загрузки.
+        Returns:
+            numpy.random.Generator при наличии NumPy, иначе random.Random
+        """
+        if np is not None:
+            return np.random.default_rng(seed)
+        return random.Random(seed)
+
+    def load_generated(self, *, batch_size, f_surnames=False, strategy="copy", rng=None):
+        """
+        Генерирует и загружает одну партию сотрудников.
+        При наличии NumPy партия генерируется векторно и для COPY
+        сразу собирается в байтовый буфер, минуя кортежи.
+        Args:
+            batch_size: Размер партии
+            f_surnames: Если True, генерирует мужчин с фамилиями на F
+            strategy: Стратегия загрузки, одна из LOAD_STRATEGIES
+            rng: Генератор из make_rng
+        Returns:
+            int: Количество загруженных строк; None, если партия не загружена
+        """
+        rng = rng if rng is not None else self.make_rng()
+
+        if np is None:
+            rows = EmployeeManager.iter_batch_employees(batch_size=batch_size, f_surnames=f_surnames, rng=rng)
+            return self.load_batch(rows=rows, strategy=strategy)
+
+        columns = EmployeeManager.generate_columns(batch_size=batch_size, f_surnames=f_surnames, rng=rng)
+        if strategy == "copy":
+            return self.database.copy_from(query=self.copy_query, file=self.columns_to_copy_buffer(columns))
+        return self.load_batch(rows=self.columns_to_rows(columns), strategy=strategy)
+
+    def load_employees(self, *, count, f_count=0, strategy="copy", batch_size=100000, seed=None, label=""):
+        """
+        Генерирует и загружает сотрудников партиями через одно соединение из пула.
+        Args:
+            count: Количество обычных сотрудников (50/50 мужчин и женщин)
+            f_count: Количество мужчин с фамилией на F, добавляемых в конце
+            strategy: Стратегия загрузки, одна из LOAD_STRATEGIES
+            batch_size: Размер одной партии
+            seed: Начальное значение генератора случайных чисел
+            label: Префикс для сообщений о прогрессе
+        Returns:
+            int: Количество загруженных сотрудников по данным сервера
+        Raises:
+            RuntimeError: Если партия не загружена
+        """
+        rng = self.make_rng(seed)
+        generated = 0
+        added = 0
+
+        with self.database.session():
+            # Добавляем обычных сотрудников
+            while generated < count:
+                current_size = min(batch_size, count - generated)
+                print(f"{label}Генерация партии {generated + 1}-{generated + current_size}...")
+
+                loaded = self.load_generated(batch_size=current_size, strategy=strategy, rng=rng)
+                if loaded is None:
+                    raise RuntimeError(f"{label}Партия {generated + 1}-{generated + current_size} не загружена")
+
+                generated += current_size
+                added += loaded
+                print(f"{label}Прогресс: {added}/{count + f_count} ({added / (count + f_count) * 100:.1f}%)")
+
+            if f_count:
+                print(f"{label}Добавление {f_count} мужчин с фамилией на F...")
+                loaded = self.load_generated(batch_size=f_count, f_surnames=True, strategy=strategy, rng=rng)
+                if loaded is None:
+                    raise RuntimeError(f"{label}Партия мужчин с фамилией на F не загружена")
+                added += loaded
+
+        return added
+
+    def add_one_million_employees(self, *, strategy="copy", seed=None, workers=1, total=1000000):
+        """
+        Добавляет миллион сотрудников в базу данных партиями
+        Args:
+            strategy: Стратегия загрузки, одна из LOAD_STRATEGIES
+            seed: Начальное значение генератора случайных чисел,
+                  позволяет сравнивать стратегии на одинаковых данных
+            workers: Количество процессов; при workers > 1 загрузка идет параллельно
+            total: Общее количество сотрудников, включая 100 мужчин с фамилией на F
+        """
+        batch_size = 100000
+        f_employees = 100
+        regular_employees = total - f_employees
+
+        if strategy not in self.LOAD_STRATEGIES:
+            print(f"Неизвестная стратегия загрузки: {strategy}. Доступные: {', '.join(self.LOAD_STRATEGIES)}")
+            return
+
+        try:
+            print(f"Начинаем добавление {total} сотрудников партиями по {batch_size} (стратегия {strategy})...")
+            start_time = time.perf_counter()
+
+            if workers > 1:
+                added = self.add_employees_parallel(
+                    count=regular_employees, f_count=f_employees, strategy=strategy,
+                    seed=seed, workers=workers, batch_size=batch_size
+                )
+            else:
+                added = self.load_employees(
+                    count=regular_employees, f_count=f_employees, strategy=strategy,
+                    batch_size=batch_size, seed=seed
+                )
+
+            print(f"Готово! Всего добавлено: {added}/{total} сотрудников.")
+            print(f"[*] Время загрузки ({strategy}, процессов: {workers}): "
+                  f"{time.perf_counter() - start_time:.6f} секунд.")
+
+        except Exception as e:
+            print(f"Не удалось добавить сотрудников: {e}")
+
+    @staticmethod
+    def split_into_shards(*, count, f_count, workers, seed=None):
+        """
+        Делит загрузку на шарды для параллельных процессов.
+        Обычные сотрудники распределяются поровну, мужчины с фамилией на F
+        целиком попадают в первый шард, поэтому итоговое количество строк
+        совпадает с последовательной загрузкой.
+        Args:
+            count: Количество обычных сотрудников
+            f_count: Количество мужчин с фамилией на F
+            workers: Количество шардов
+            seed: Базовое значение seed; шард i получает seed + i
+        Returns:
+            list: Список словарей с параметрами шардов
+        """
+        base, remainder = divmod(count, workers)
+        shards = []
+        for index in range(workers):
+            shards.append({
+                "index": index,
+                "count": base + (1 if index < remainder else 0),
+                "f_count": f_count if index == 0 else 0,
+                "seed": None if seed is None else seed + index,
+            })
+        return shards
+
+    def add_employees_parallel(self, *, count, f_count, strategy="copy", seed=None, workers=None,
+                               batch_size=100000):
+        """
+        Загружает сотрудников параллельно в нескольких процессах.
+        Каждый процесс генерирует свой шард с независимым seed
+        и загружает его через собственное соединение.
+        Args:
+            count: Количество обычных сотрудников
+            f_count: Количество мужчин с фамилией на F
+            strategy: Стратегия загрузки, одна из LOAD_STRATEGIES
+            seed: Базовое значение seed
+            workers: Количество процессов (по умолчанию - число ядер)
+            batch_size: Размер партии внутри шарда
+        Returns:
+            int: Количество загруженных сотрудников
+        """
+        workers = workers or os.cpu_count() or 1
+        shards = self.split_into_shards(count=count, f_count=f_count, workers=workers, seed=seed)
+        for shard in shards:
+            shard.update(strategy=strategy, batch_size=batch_size, table=self.table)
+
+        print(f"Запуск параллельной загрузки: {workers} процессов")
+        added = 0
+        with Pool(processes=workers) as pool:
+            for index, loaded in pool.imap_unordered(_load_shard, shards):
+                added += loaded
+                print(f"Шард {index} завершен: {loaded} сотрудников")
+
+        # Данные записаны другими процессами, поэтому кеш этого процесса сбрасываем явно
+        Database.invalidate_cache()
+
+        return added
+
+    def load_profile_batches(self, *, generator, batches, strategy="copy", label=""):
+        """
+        Генерирует и загружает партии набора данных по профилю через одно соединение.
+        Args:
+            generator: Объект DatasetGenerator
+            batches: Номера партий
+            strategy: Стратегия загрузки, одна из LOAD_STRATEGIES
+            label: Префикс для сообщений о прогрессе
+        Returns:
+            int: Количество загруженных сотрудников по данным сервера
+        Raises:
+            RuntimeError: Если партия не загружена
+        """
+        added = 0
+        with self.database.session():
+            for index in batches:
+                batch = generator.generate_batch(index)
+                if strategy == "copy":
+                    loaded = self.database.copy_from(query=self.copy_query,
+                                                     file=generator.batch_to_copy_buffer(batch))
+                else:
+                    rows = list(zip(batch["full_name"], batch["birth_date"], batch["gender"]))
+                    loaded = self.load_batch(rows=rows, strategy=strategy)
+                if loaded is None:
+                    raise RuntimeError(f"{label}Партия {index + 1}/{generator.batch_count} не загружена")
+                added += loaded
+                print(f"{label}Партия {index + 1}/{generator.batch_count} загружена")
+        return added
+
+    def load_profile(self, profile, *, strategy="copy", workers=1, replace=True):
+        """
+        Загружает набор данных по профилю и сохраняет профиль в таблицу dataset_profiles,
+        чтобы отчеты замеров знали, на каких данных они получены.
+        Args:
+            profile: Объект DatasetProfile
+            strategy: Стратегия загрузки, одна из LOAD_STRATEGIES
+            workers: Количество процессов; партии распределяются между ними по кругу
+            replace: Очистить таблицу перед загрузкой
+        Returns:
+            int: Количество загруженных сотрудников
+        """
+        if strategy not in self.LOAD_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия загрузки: {strategy}. Доступные: {', '.join(self.LOAD_STRATEGIES)}")
+
+        generator = DatasetGenerator(profile)
+        if replace:
+            self.database.clear_table(truncate=True)
+
+        print(f"Загрузка профиля {profile.name}: {profile.rows} строк, на 'F': {profile.f_rows}, "
+              f"мужчин: {profile.male_rows}, zipf: {profile.zipf}, seed: {profile.seed}")
+        start_time = time.perf_counter()
+
+        if workers > 1:
+            shards = [{"index": index, "profile": profile.to_dict(), "strategy": strategy, "table": self.table,
+                       "batches": list(range(index, generator.batch_count, workers))}
+                      for index in range(workers)]
+            added = 0
+            with Pool(processes=workers) as pool:
+                for index, loaded in pool.imap_unordered(_load_profile_shard, shards):
+                    added += loaded
+                    print(f"Шард {index} завершен: {loaded} сотрудников")
+            Database.invalidate_cache()
+        else:
+            added = self.load_profile_batches(generator=generator, batches=range(generator.batch_count),
+                                              strategy=strategy)
+
+        load_seconds = time.perf_counter() - start_time
+        # Свежая статистика нужна, чтобы планы запросов в замерах соответствовали профилю
+        self.database.query_the_database(query="ANALYZE employees;")
+        self.database.record_dataset_profile(profile=profile, rows_loaded=added, load_seconds=load_seconds)
+
+        print(f"Готово! Загружено {added} сотрудников.")
+        print(f"[*] Время загрузки ({strategy}, процессов: {workers}): {load_seconds:.6f} секунд.")
+        return added
+
+    def load_rows(self, *, count, f_count, strategy="copy", seed=None, workers=1, batch_size=100000):
+        """Загружает сотрудников в self.table последовательно или в несколько процессов"""
+        if workers > 1:
+            return self.add_employees_parallel(count=count, f_count=f_count, strategy=strategy, seed=seed,
+                                               workers=workers, batch_size=batch_size)
+        return self.load_employees(count=count, f_count=f_count, strategy=strategy, batch_size=batch_size, seed=seed)
+
+    def reload_employees(self, *, count, f_count=0, strategy="copy", seed=None, workers=1, batch_size=100000,
+                         maintenance_work_mem="1GB", logged=True):
+        """
+        Полностью заменяет содержимое таблицы: загрузка в промежуточную UNLOGGED таблицу без индексов,
+        перевод в LOGGED, построение первичного ключа и индексов, атомарная подмена таблиц и ANALYZE.
+        SET LOGGED переписывает таблицу вместе с индексами, поэтому выполняется до их построения.
+        При ошибке до подмены таблица employees остается прежней.
+        Args:
+            count: Количество обычных сотрудников
+            f_count: Количество мужчин с фамилией на F
+            strategy: Стратегия загрузки, одна из LOAD_STRATEGIES
+            seed: Начальное значение генератора случайных чисел
+            workers: Количество процессов загрузки
+            batch_size: Размер партии
+            maintenance_work_mem: Память для построения индексов (например, "1GB"); None - настройка сервера
+            logged: Перевести таблицу в LOGGED перед подменой (иначе данные не переживут сбой сервера)
+        Returns:
+            dict: Время этапов в секундах и количество загруженных строк
+        """
+        if strategy not in self.LOAD_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия загрузки: {strategy}. Доступные: {', '.join(self.LOAD_STRATEGIES)}")
+
+        db = self.database
+        table = self.table
+        staging = f"{table}_staging"
+        timings = {}
+
+        # Индексы переносятся с текущей таблицы, чтобы после подмены набор индексов не изменился
+        indexes = []
+        for name, definition in db.table_indexes(table):
+            new_definition, replaced = re.subn(
+                rf"^(CREATE (?:UNIQUE )?INDEX) {name} ON ((?:ONLY )?(?:\w+\.)?){table} ",
+                rf"\1 {name}_new ON \2{staging} ", definition)
+            if replaced:
+                indexes.append((name, new_definition))
+            else:
+                logger.warning(f"Индекс {name} не перенесен: не удалось разобрать определение {definition}")
+
+        start_time = time.perf_counter()
+        db.query_the_database(query=f"DROP TABLE IF EXISTS {staging}; "
+                                    f"CREATE UNLOGGED TABLE {staging} (LIKE {table} INCLUDING DEFAULTS);")
+        if db.table_rows(staging) != 0:
+            raise RuntimeError(f"Не удалось создать таблицу {staging}")
+
+        loaded = EmployeeManager(table=staging).load_rows(count=count, f_count=f_count, strategy=strategy,
+                                                          seed=seed, workers=workers, batch_size=batch_size)
+        timings["load"] = time.perf_counter() - start_time
+
+        with db.session():
+            if db.table_rows(staging) != loaded:
+                raise RuntimeError(f"Загрузка в {staging} завершилась ошибкой, таблица {table} не изменена")
+
+            start_time = time.perf_counter()
+            if logged and db.query_the_database(query=f"ALTER TABLE {staging} SET LOGGED;") is None:
+                raise RuntimeError(f"Не удалось перевести {staging} в LOGGED, таблица {table} не изменена")
+            timings["set_logged"] = time.perf_counter() - start_time
+
+            if maintenance_work_mem:
+                db.query_the_database(query="SET maintenance_work_mem = %s;", params=(maintenance_work_mem,))
+            try:
+                start_time = time.perf_counter()
+                db.query_the_database(query=f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY (id);")
+                for name, definition in indexes:
+                    index_start = time.perf_counter()
+                    db.query_the_database(query=definition)
+                    logger.info(f"Индекс {name} построен за {time.perf_counter() - index_start:.3f} секунд")
+                timings["indexes"] = time.perf_counter() - start_time
+            finally:
+                if maintenance_work_mem:
+                    db.query_the_database(query="RESET maintenance_work_mem;")
+
+            # Подмена одной транзакцией: последовательность id переходит к новой таблице,
+            # старая таблица удаляется, новая получает ее имя и имена индексов
+            start_time = time.perf_counter()
+            rows = db.query_the_database(query="SELECT pg_get_serial_sequence(%s, 'id');", params=(table,), fetch=True)
+            sequence = rows[0][0] if rows else None
+            statements = [f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE;"]
+            if sequence:
+                statements.append(f"ALTER SEQUENCE {sequence} OWNED BY {staging}.id;")
+            statements += [
+                f"DROP TABLE {table};",
+                f"ALTER TABLE {staging} RENAME TO {table};",
+                f"ALTER TABLE {table} RENAME CONSTRAINT {staging}_pkey TO {table}_pkey;",
+            ]
+            statements += [f"ALTER INDEX {name}_new RENAME TO {name};" for name, _ in indexes]
+            if table == "employees" and EmployeeStats(db).installed():
+                # Триггеры статистики удалены вместе со старой таблицей: создаем их заново
+                # и пересчитываем статистику в той же транзакции
+                statements += [EmployeeStats.TRIGGERS_QUERY, EmployeeStats.REBUILD_QUERY]
+            db.query_the_database(query=" ".join(statements))
+            if db.table_rows(staging) is not None:
+                raise RuntimeError(f"Не удалось подменить таблицу {table}, новые данные остались в {staging}")
+            timings["swap"] = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            db.query_the_database(query=f"ANALYZE {table};")
+            timings["analyze"] = time.perf_counter() - start_time
+
+        # Запросы, закешированные до подмены, относятся к старой таблице
+        Database.invalidate_cache()
+        timings["total"] = sum(timings.values())
+        timings["rows"] = loaded
+        return timings
+
+    def reload_in_place(self, *, count, f_count=0, strategy="copy", seed=None, workers=1, batch_size=100000,
+                        truncate=False):
+        """
+        Текущий способ перезагрузки для сравнения: очистка таблицы и загрузка в нее при существующих индексах.
+        Args:
+            truncate: Очищать таблицу TRUNCATE вместо DELETE
+        Returns:
+            dict: Время этапов в секундах и количество загруженных строк
+        """
+        timings = {}
+        start_time = time.perf_counter()
+        self.database.clear_table(truncate=truncate)
+        timings["clear"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        loaded = self.load_rows(count=count, f_count=f_count, strategy=strategy, seed=seed, workers=workers,
+                                batch_size=batch_size)
+        timings["load"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        self.database.query_the_database(query=f"ANALYZE {self.table};")
+        timings["analyze"] = time.perf_counter() - start_time
+
+        timings["total"] = sum(timings.values())
+        timings["rows"] = loaded
+        return timings
+
+    def compare_reload_paths(self, *, total=1000000, strategy="copy", seed=None, workers=1):
+        """
+        Сравнивает способы перезагрузки таблицы на одинаковых данных:
+        DELETE + загрузка, TRUNCATE + загрузка и загрузка через промежуточную таблицу.
+        Args:
+            total: Общее количество сотрудников, включая 100 мужчин с фамилией на F
+            strategy: Стратегия загрузки
+            seed: Начальное значение генератора; по умолчанию фиксированное, чтобы данные совпадали
+            workers: Количество процессов загрузки
+        Returns:
+            dict: Время этапов для каждого способа
+        """
+        f_count = 100
+        seed = seed if seed is not None else 1
+        options = {"count": total - f_count, "f_count": f_count, "strategy": strategy, "seed": seed,
+                   "workers": workers}
+
+        results = {}
+        print("\n=== СРАВНЕНИЕ СПОСОБОВ ПЕРЕЗАГРУЗКИ ===")
+        print("[reload] DELETE + загрузка в таблицу с индексами")
+        results["delete"] = self.reload_in_place(**options)
+        print("[reload] TRUNCATE + загрузка в таблицу с индексами")
+        results["truncate"] = self.reload_in_place(truncate=True, **options)
+        print("[reload] промежуточная UNLOGGED таблица, индексы после загрузки, подмена")
+        results["staging"] = self.reload_employees(**options)
+
+        phases = ("clear", "load", "set_logged", "indexes", "swap", "analyze", "total")
+        print("\n{:<10} ".format("Способ") + " ".join("{:>11}".format(phase) for phase in phases))
+        print("-" * 96)
+        for name, timings in results.items():
+            print("{:<10} ".format(name) + " ".join(
+                "{:>11.3f}".format(timings[phase]) if phase in timings else "{:>11}".format("-") for phase in phases))
+        return results
+
+
+def _load_shard(shard):
+    """
+    Загружает один шард сотрудников в отдельном процессе.
+    Args:
+        shard: Словарь с параметрами шарда из EmployeeManager.split_into_shards
+    Returns:
+        tuple: Номер шарда и количество загруженных сотрудников
+    """
+    try:
+        loaded = EmployeeManager(table=shard["table"]).load_employees(
+            count=shard["count"], f_count=shard["f_count"], strategy=shard["strategy"],
+            batch_size=shard["batch_size"], seed=shard["seed"], label=f"[шард {shard['index']}] "
+        )
+    finally:
+        Database.close_pool()
+    return shard["index"], loaded
+
+
+def _load_profile_shard(shard):
+    """
+    Загружает партии набора данных по профилю в отдельном процессе.
+    Args:
+        shard: Словарь с профилем, номерами партий и стратегией
+    Returns:
+        tuple: Номер шарда и количество загруженных сотрудников
+    """
+    try:
+        generator = DatasetGenerator(DatasetProfile.from_dict(shard["profile"]))
+        loaded = EmployeeManager(table=shard["table"]).load_profile_batches(
+            generator=generator, batches=shard["batches"], strategy=shard["strategy"],
+            label=f"[шард {shard['index']}] "
+        )
+    finally:
+        Database.close_pool()
+    return shard["index"], loaded
+
+
+class EmployeeImporter:
+    """
+    Класс для потокового импорта сотрудников из CSV и JSONL файлов.
+
+    Файл читается порциями: каждая порция проверяется по тем же правилам,
+    что и сеттеры Employee, корректные записи загружаются одной партией
+    (если сервер ее отклонил - по одной записи), а отклоненные пишутся
+    в отдельный CSV файл с текстом ошибки.
+    Память не зависит от размера файла.
+    """
+    FIELDS = ("full_name", "birth_date", "gender")
+    FORMATS = ("csv", "jsonl")
+
+    def __init__(self, *, chunk_size=import_chunk_size, strategy="copy"):
+        """
+        Args:
+            chunk_size: Количество записей в одной порции
+            strategy: Стратегия загрузки, одна из EmployeeManager.LOAD_STRATEGIES
+        """
+        self.manager = EmployeeManager()
+        self.chunk_size = chunk_size
+        self.strategy = strategy
+
+    @classmethod
+    def detect_format(cls, path):
+        """Определяет формат файла по расширению (.csv, .jsonl, .ndjson)"""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        raise ValueError(f"Неизвестный формат файла {path}, ожидается один из: {', '.join(cls.FORMATS)}")
+
+    @classmethod
+    def iter_records(cls, file, file_format):
+        """
+        Лениво читает записи из открытого файла.
+        CSV файл должен содержать заголовок с полями full_name, birth_date, gender.
+        Args:
+            file: Открытый текстовый файл
+            file_format: "csv" или "jsonl"
+        Yields:
+            tuple: (номер строки, словарь записи или None, текст ошибки разбора или None)
+        """
+        if file_format == "csv":
+            reader = csv.DictReader(file)
+            missing = [field for field in cls.FIELDS if field not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"В заголовке CSV нет полей: {', '.join(missing)}")
+            for record in reader:
+                yield reader.line_num, record, None
+            return
+
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Некорректный JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Строка JSONL должна быть объектом"
+                continue
+            yield line_number, record, None
+
+    @staticmethod
+    def validate_records(records):
+        """
+        Проверяет порцию записей по правилам сеттеров Employee.
+        Args:
+            records: Список кортежей из iter_records
+        Returns:
+            tuple: (список корректных записей (номер строки, запись, строка для загрузки),
+                    список отклоненных записей (номер строки, запись, ошибка))
+        """
+        parsed = []
+        rejects = []
+
+        for line_number, record, parse_error in records:
+            if parse_error:
+                rejects.append((line_number, record or {}, parse_error))
+            else:
+                parsed.append((line_number, record))
+
+        columns = [[None if record.get(field) is None else str(record.get(field)) for _, record in parsed]
+                   for field in EmployeeImporter.FIELDS]
+        employees, codes = Employee.validate_many(full_names=columns[0], birth_dates=columns[1], genders=columns[2])
+
+        valid = []
+        for (line_number, record), employee, code in zip(parsed, employees, codes):
+            if code:
+                rejects.append((line_number, record, "; ".join(Employee.describe_errors(code))))
+            else:
+                valid.append((line_number, record, employee.as_tuple()))
+
+        rejects.sort(key=lambda reject: reject[0])
+        return valid, rejects
+
+    def load_valid(self, valid):
+        """
+        Загружает корректные записи порции одной партией.
+        Если сервер отклонил партию, записи загружаются по одной,
+        чтобы одна ошибочная строка не потянула за собой всю порцию.
+        Args:
+            valid: Список (номер строки, запись, строка для загрузки) из validate_records
+        Returns:
+            tuple: (количество загруженных строк, список отклоненных записей (номер строки, запись, ошибка))
+        """
+        loaded = self.manager.load_batch(rows=[row for _, _, row in valid], strategy=self.strategy)
+        if loaded is not None:
+            return loaded, []
+
+        print(f"Партия из {len(valid)} записей не загружена, повтор по одной записи...")
+        loaded = 0
+        rejects = []
+        for line_number, record, row in valid:
+            if self.manager.load_batch(rows=[row], strategy=self.strategy) is None:
+                rejects.append((line_number, record, "Запись отклонена сервером"))
+            else:
+                loaded += 1
+        return loaded, rejects
+
+    def import_file(self, path, *, rejects_path=None, file_format=None):
+        """
+        Импортирует сотрудников из файла.
+        Args:
+            path: Путь к CSV или JSONL файлу
+            rejects_path: Путь к CSV файлу для отклоненных записей
+                          (по умолчанию <path>.rejects.csv)
+            file_format: "csv" или "jsonl"; по умолчанию определяется по расширению
+        Returns:
+            dict: Количество прочитанных, загруженных и отклоненных записей
+        """
+        file_format = file_format or self.detect_format(path)
+        rejects_path = rejects_path or f"{path}.rejects.csv"
+        stats = {"read": 0, "loaded": 0, "rejected": 0}
+        start_time = time.perf_counter()
+
+        with open(path, newline="", encoding="utf-8") as source, \
+                open(rejects_path, "w", newline="", encoding="utf-8") as rejects_file, \
+                self.manager.database.session():
+            rejects_writer = csv.writer(rejects_file)
+            rejects_writer.writerow(("line", *self.FIELDS, "error"))
+            records = self.iter_records(source, file_format)
+
+            while True:
+                chunk = list(islice(records, self.chunk_size))
+                if not chunk:
+                    break
+
+                valid, rejects = self.validate_records(chunk)
+                if valid:
+                    loaded, load_rejects = self.load_valid(valid)
+                    stats["loaded"] += loaded
+                    rejects = sorted(rejects + load_rejects, key=lambda reject: reject[0])
+                for line_number, record, error in rejects:
+                    rejects_writer.writerow((line_number, *(record.get(field) for field in self.FIELDS), error))
+
+                stats["read"] += len(chunk)
+                stats["rejected"] += len(rejects)
+                print(f"Обработано записей: {stats['read']}, загружено: {stats['loaded']}, "
+                      f"отклонено: {stats['rejected']}")
+
+        print(f"Импорт завершен. Отклоненные записи: {rejects_path}")
+        print(f"[*] Время импорта: {time.perf_counter() - start_time:.6f} секунд.")
+        return stats
+
+
+class EmployeeExporter:
+    """
+    Класс для быстрой выгрузки сотрудников в файл или канал.
+
+    CSV и JSONL выгружаются командой COPY ... TO STDOUT: строки формирует PostgreSQL
+    и передает их прямо в файл. Parquet (необязательно, требуется pyarrow) пишется
+    группами строк из серверного курсора. Возраст считается при выгрузке.
+    """
+    FORMATS = ("csv", "jsonl", "parquet")
+    COLUMNS = ("id", "full_name", "birth_date", "age", "gender")
+    # Наборы данных: все сотрудники или результат поиска мужчин с фамилией на 'F'
+    SUBSETS = {
+        "all": "SELECT id, full_name, birth_date, date_part('year', age(birth_date))::int AS age, gender "
+               "FROM employees",
+        "f": "SELECT id, full_name, birth_date, date_part('year', age(birth_date))::int AS age, gender "
+             "FROM employees WHERE gender = 'Male' AND full_name LIKE 'F%' ORDER BY full_name",
+    }
+
+    def __init__(self, database=None):
+        """
+        Args:
+            database: Объект Database; по умолчанию создается новый
+        """
+        self.database = database or Database()
+
+    @classmethod
+    def detect_format(cls, path):
+        """Определяет формат по расширению файла; для "-" (stdout) и неизвестных расширений - csv"""
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        if extension in ("jsonl", "ndjson"):
+            return "jsonl"
+        if extension == "parquet":
+            return "parquet"
+        return "csv"
+
+    def copy_query(self, *, subset, file_format):
+        """
+        Формирует команду COPY для выгрузки.
+        Для JSONL используется режим CSV с символами-разделителями, которых нет в JSON,
+        поэтому строки row_to_json выводятся без экранирования.
+        """
+        query = self.SUBSETS[subset]
+        if file_format == "csv":
+            return f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)"
+        return (f"COPY (SELECT row_to_json(t) FROM ({query}) t) TO STDOUT "
+                f"WITH (FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02')")
+
+    def export(self, *, path, file_format=None, subset="all", chunk_size=stream_chunk_size):
+        """
+        Выгружает сотрудников.
+        Args:
+            path: Путь к файлу или "-" для стандартного вывода
+            file_format: csv, jsonl или parquet; по умолчанию определяется по расширению
+            subset: Ключ SUBSETS
+            chunk_size: Размер группы строк для Parquet
+        Returns:
+            int: Количество выгруженных строк или None при ошибке
+        """
+        file_format = file_format or self.detect_format(path)
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Неизвестный формат {file_format}, доступные: {', '.join(self.FORMATS)}")
+        if subset not in self.SUBSETS:
+            raise ValueError(f"Неизвестный набор данных {subset}, доступные: {', '.join(self.SUBSETS)}")
+
+        if file_format == "parquet":
+            if path == "-":
+                raise ValueError("Parquet выгружается только в файл")
+            return self.export_parquet(path=path, subset=subset, chunk_size=chunk_size)
+
+        query = self.copy_query(subset=subset, file_format=file_format)
+        if path == "-":
+            return self.database.copy_to(query=query, file=sys.stdout.buffer)
+        with open(path, "wb") as file:
+            return self.database.copy_to(query=query, file=file)
+
+    def export_parquet(self, *, path, subset, chunk_size):
+        """Выгружает сотрудников в Parquet группами строк из серверного курсора"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Для выгрузки в Parquet требуется пакет pyarrow")
+
+        schema = pa.schema([
+            ("id", pa.int32()), ("full_name", pa.string()), ("birth_date", pa.date32()),
+            ("age", pa.int32()), ("gender", pa.string()),
+        ])
+        exported = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for rows in self.database.stream_query(query=self.SUBSETS[subset], chunk_size=chunk_size):
+                columns = list(zip(*rows))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+                ))
+                exported += len(rows)
+        return exported
+
+
+class EmployeeView:
+    """
+    Класс для отображения данных о сотрудниках.
+    Предоставляет методы для получения и отображения данных
+    из таблицы employees.
+    """
+
+    ALL_EMPLOYEES_QUERY = "SELECT * FROM employees ORDER BY full_name;"
+    F_SEARCH_QUERY = """
+        SELECT * FROM employees
+        WHERE gender = 'Male' AND full_name LIKE 'F%'
+        ORDER BY full_name;
+    """
+    AGE_SQL_QUERY = """
+        SELECT id, full_name, birth_date, date_part('year', age(birth_date))::int AS age, gender
+        FROM employees ORDER BY full_name;
+    """
+    # LIKE 'abc%' может использовать B-tree индекс по full_name, только если столбец в нем
+    # сравнивается по кодам символов: класс операторов *_pattern_ops или collation "C".
+    # Подходят также триграммные индексы pg_trgm и индекс по фамилии split_part(full_name, ' ', 1)
+    PREFIX_INDEX_COLUMN = re.compile(
+        r'(?:\bsplit_part\(\(?full_name\)?(?:::\w+)?,[^(),]*,\s*1\)|\bfull_name\)?(?:::\w+)?\)?)\s+'
+        r'(?:COLLATE\s+(?:pg_catalog\.)?"(?:C|POSIX)"|(?:text|varchar|bpchar)_pattern_ops|gin_trgm_ops|gist_trgm_ops)')
+    C_COLLATIONS = ("C", "POSIX")
+
+    def __init__(self, database=None, *, use_cache=True, prefix_index=None):
+        """
+        Args:
+            database: Объект Database; по умолчанию создается новый
+            use_cache: Использовать кеш результатов Database.cache, если он включен
+            prefix_index: Загруженный PrefixIndex; если задан, search_prefix работает без запросов к серверу
+        """
+        self.database = database or Database()
+        self.use_cache = use_cache
+        self.prefix_index = prefix_index
+        self.age_source = None  # Способ расчета возраста, выбранный choose_age_source
+
+    def get_all_employees(self):
+        """Получает список всех сотрудников из БД"""
+        return self.database.query_the_database(query=self.ALL_EMPLOYEES_QUERY, fetch=True, use_cache=self.use_cache)
+
+    def iter_employees(self, *, chunk_size=stream_chunk_size):
+        """
+        Потоково получает всех сотрудников через серверный курсор.
+        Args:
+            chunk_size: Количество строк, получаемых с сервера за один раз
+        Yields:
+            tuple: Строка таблицы (id, full_name, birth_date, gender)
+        """
+        for rows in self.database.stream_query(query=self.ALL_EMPLOYEES_QUERY, chunk_size=chunk_size):
+            yield from rows
+
+    def iter_employees_with_age(self, *, chunk_size=stream_chunk_size, age_source="python"):
+        """
+        Потоково получает сотрудников вместе с возрастом.
+        Args:
+            chunk_size: Количество строк, получаемых с сервера за один раз
+            age_source: "python" - возраст считается пакетно на клиенте (Employee.calculate_ages),
+                        "sql" - возраст считает PostgreSQL (date_part('year', age(birth_date)))
+        Yields:
+            tuple: (id, full_name, birth_date, age, gender)
+        """
+        if age_source == "sql":
+            for rows in self.database.stream_query(query=self.AGE_SQL_QUERY, chunk_size=chunk_size):
+                yield from rows
+            return
+
+        today = datetime.now().date()
+        for rows in self.database.stream_query(query=self.ALL_EMPLOYEES_QUERY, chunk_size=chunk_size):
+            ages = Employee.calculate_ages(birth_dates=[row[2] for row in rows], today=today)
+            for (emp_id, full_name, birth_date, gender), age in zip(rows, ages):
+                yield emp_id, full_name, birth_date, age, gender
+
+    def measure_age_sources(self, *, sample_size=100000):
+        """
+        Замеряет получение сотрудников с возрастом обоими способами на выборке.
+        Args:
+            sample_size: Количество строк в выборке
+        Returns:
+            dict: Время в секундах для "python" и "sql"
+        """
+        queries = {
+            "python": f"SELECT * FROM employees LIMIT {int(sample_size)};",
+            "sql": self.AGE_SQL_QUERY.replace("ORDER BY full_name;", f"LIMIT {int(sample_size)};"),
+        }
+        timings = {}
+        with self.database.session():
+            for source, query in queries.items():
+                start = time.perf_counter()
+                rows = self.database.query_the_database(query=query, fetch=True) or []
+                if source == "python":
+                    Employee.calculate_ages(birth_dates=[row[2] for row in rows])
+                timings[source] = time.perf_counter() - start
+        return timings
+
+    def choose_age_source(self, *, sample_size=10000):
+        """
+        Выбирает более быстрый способ расчета возраста по замеру на выборке.
+        Результат запоминается, замер выполняется один раз на экземпляр.
+        Returns:
+            str: "python" или "sql"
+        """
+        if self.age_source is None:
+            timings = self.measure_age_sources(sample_size=sample_size)
+            self.age_source = min(timings, key=timings.get)
+        return self.age_source
+
+    def display_employees_with_age(self, *, chunk_size=stream_chunk_size, age_source="auto"):
+        """
+        Отображает список сотрудников с их возрастом.
+
+        Получает данные из БД потоково, вычисляет возраст пакетно для каждой порции и
+        сразу выводит строки таблицы, не накапливая весь список в памяти.
+        Args:
+            chunk_size: Количество строк, получаемых с сервера за один раз
+            age_source: "python", "sql" или "auto" - выбрать более быстрый по замеру
+        """
+        if age_source == "auto":
+            age_source = self.choose_age_source()
+
+        printed = 0
+        for emp_id, full_name, birth_date, age, gender in self.iter_employees_with_age(
+                chunk_size=chunk_size, age_source=age_source):
+            if not printed:
+                # Выводим заголовок таблицы перед первой строкой
+                print("\n{:<5} {:<35} {:<15} {:<8} {:<8}".format(
+                    "ID", "ФИО", "Дата рождения", "Возраст", "Пол"))
+                print("-" * 75)
+
+            print("{:<5} {:<35} {:<15} {:<8} {:<8}".format(
+                emp_id, full_name, birth_date.strftime("%Y-%m-%d"), age, gender))
+            printed += 1
+
+        if not printed:
+            print("Список сотрудников пуст")
+
+    @staticmethod
+    def encode_cursor(direction, row):
+        """
+        Кодирует позицию страницы в строковый токен.
+        Args:
+            direction: "next" - страница после строки, "prev" - страница перед строкой
+            row: Строка таблицы (id, full_name, ...)
+        Returns:
+            str: Токен для передачи в get_page
+        """
+        payload = json.dumps({"d": direction, "k": [row[1], row[0]]}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Раскодирует токен из encode_cursor.
+        Returns:
+            tuple: (направление, full_name, id)
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            full_name, emp_id = payload["k"]
+            if payload["d"] not in ("next", "prev"):
+                raise ValueError(payload["d"])
+            return payload["d"], full_name, int(emp_id)
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Некорректный токен страницы: {cursor}") from e
+
+    @staticmethod
+    def escape_like(value):
+        """Экранирует спецсимволы LIKE, чтобы значение искалось как обычный текст"""
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def get_page(self, *, page_size=20, cursor=None, gender=None, prefix=None):
+        """
+        Возвращает страницу сотрудников, отсортированных по (full_name, id).
+        Используется пагинация по ключу: страница начинается сразу после (или перед)
+        ключом из токена, поэтому любая страница стоит столько же, сколько первая.
+        Args:
+            page_size: Количество сотрудников на странице
+            cursor: Токен next_cursor/prev_cursor предыдущего вызова; None - первая страница
+            gender: Необязательный фильтр по полу
+            prefix: Необязательный фильтр по началу ФИО
+        Returns:
+            dict: rows - строки страницы, next_cursor и prev_cursor - токены соседних страниц или None
+        """
+        conditions = []
+        params = []
+        direction = "next"
+
+        if cursor:
+            direction, full_name, emp_id = self.decode_cursor(cursor)
+            conditions.append("(full_name, id) > (%s, %s)" if direction == "next" else "(full_name, id) < (%s, %s)")
+            params.extend([full_name, emp_id])
+        if gender:
+            conditions.append("gender = %s")
+            params.append(gender.title())
+        if prefix:
+            conditions.append("full_name LIKE %s")
+            params.append(self.escape_like(prefix) + "%")
+
+        order = "full_name, id" if direction == "next" else "full_name DESC, id DESC"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT * FROM employees {where} ORDER BY {order} LIMIT %s;"
+        params.append(page_size + 1)  # Лишняя строка показывает, есть ли следующая страница
+
+        rows = self.database.query_the_database(query=query, params=tuple(params), fetch=True,
+                                                use_cache=self.use_cache) or []
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if direction == "prev":
+            rows.reverse()
+
+        if not rows:
+            return {"rows": [], "next_cursor": None, "prev_cursor": None}
+
+        has_next = has_more if direction == "next" else True
+        has_prev = bool(cursor) if direction == "next" else has_more
+        return {
+            "rows": rows,
+            "next_cursor": self.encode_cursor("next", rows[-1]) if has_next else None,
+            "prev_cursor": self.encode_cursor("prev", rows[0]) if has_prev else None,
+        }
+
+    def search_query(self, *, gender=None, surname_prefix=None, birth_from=None, birth_to=None, limit=None):
+        """
+        Формирует параметризованный запрос поиска сотрудников. Значения передаются только параметрами,
+        спецсимволы LIKE в префиксе экранируются.
+        Args:
+            gender: Пол (Male/Female)
+            surname_prefix: Начало фамилии (ФИО)
+            birth_from: Дата рождения не раньше (date или YYYY-MM-DD)
+            birth_to: Дата рождения не позже (date или YYYY-MM-DD)
+            limit: Максимальное количество строк
+        Returns:
+            tuple: (запрос, параметры)
+        """
+        conditions = []
+        params = []
+
+        if gender:
+            gender, error = Employee.validate_gender(gender)
+            if error:
+                raise ValueError(error)
+            conditions.append("gender = %s")
+            params.append(gender)
+        if surname_prefix:
+            conditions.append("full_name LIKE %s")
+            params.append(self.escape_like(surname_prefix) + "%")
+        for value, condition in ((birth_from, "birth_date >= %s"), (birth_to, "birth_date <= %s")):
+            if value:
+                birth_date, error = (value, None) if isinstance(value, date) else Employee.validate_birth_date(value)
+                if error:
+                    raise ValueError(error)
+                conditions.append(condition)
+                params.append(birth_date)
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        query = f"SELECT * FROM employees {where}ORDER BY full_name, id"
+        if limit is not None:
+            if int(limit) < 1:
+                raise ValueError("Количество строк должно быть положительным")
+            query += " LIMIT %s"
+            params.append(int(limit))
+        return query + ";", tuple(params)
+
+    def find_employees(self, *, gender=None, surname_prefix=None, birth_from=None, birth_to=None, limit=None):
+        """
+        Находит сотрудников по необязательным фильтрам (см. search_query).
+        Returns:
+            list: Кортежи (id, full_name, birth_date, gender), отсортированные по full_name и id
+        """
+        query, params = self.search_query(gender=gender, surname_prefix=surname_prefix,
+                                          birth_from=birth_from, birth_to=birth_to, limit=limit)
+        return self.database.query_the_database(query=query, params=params, fetch=True,
+                                                use_cache=self.use_cache) or []
+
+    def explain_search(self, *, analyze=False, **filters):
+        """
+        Показывает, как сервер выполнит поиск find_employees с теми же фильтрами.
+        Args:
+            analyze: Выполнить запрос (EXPLAIN ANALYZE) и получить фактическое время
+            filters: Фильтры find_employees
+        Returns:
+            dict: scans - способы чтения, used - использованные индексы, available - индексы таблицы,
+                  hints - подсказки, если подходящего индекса нет, execution_time_ms - время на сервере
+        """
+        query, params = self.search_query(**filters)
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        rows = self.database.query_the_database(query=f"EXPLAIN ({options}) {query}", params=params, fetch=True)
+        if not rows:
+            return None
+
+        plan = rows[0][0][0]
+        available = dict(self.database.table_indexes())
+        used = plan_indexes(plan["Plan"])
+        hints = []
+        if filters.get("surname_prefix") and not self.has_prefix_index(available):
+            # Обычный B-tree по full_name при collation, отличном от "C", для LIKE 'abc%' не подходит
+            hints.append("CREATE INDEX ON employees (gender, full_name text_pattern_ops);")
+        if not used:
+            definitions = " ".join(available.values())
+            if (filters.get("birth_from") or filters.get("birth_to")) and "birth_date" not in definitions:
+                hints.append("CREATE INDEX ON employees (birth_date);")
+            if not hints and available:
+                hints.append("Индексы есть, но планировщик выбрал последовательное чтение: "
+                             "фильтр отбирает слишком много строк")
+        return {
+            "scans": plan_scans(plan["Plan"]),
+            "used": used,
+            "available": list(available),
+            "hints": hints,
+            "execution_time_ms": plan.get("Execution Time"),
+        }
+
+    def has_prefix_index(self, available):
+        """
+        Проверяет, есть ли индекс, пригодный для поиска по началу ФИО (LIKE 'abc%').
+        Args:
+            available: Словарь имя индекса -> определение из Database.table_indexes
+        Returns:
+            bool: True, если full_name (или фамилия split_part) проиндексирован с *_pattern_ops,
+                  collation "C" или триграммами pg_trgm, либо обычным индексом при collation "C" у базы данных
+        """
+        definitions = available.values()
+        if any(self.PREFIX_INDEX_COLUMN.search(definition) for definition in definitions):
+            return True
+        if not any(re.search(r"\bfull_name\b", definition) for definition in definitions):
+            return False
+        rows = self.database.query_the_database(
+            query="SELECT datcollate FROM pg_database WHERE datname = current_database();", fetch=True)
+        return bool(rows) and rows[0][0] in self.C_COLLATIONS
+
+    def prefix_query(self, prefix, *, gender=None, limit=None):
+        """
+        Формирует SQL запрос поиска по началу ФИО.
+        Returns:
+            tuple: (запрос, параметры)
+        """
+        return self.search_query(gender=gender, surname_prefix=prefix, limit=limit)
+
+    def search_prefix(self, prefix, *, gender=None, limit=None):
+        """
+        Находит сотрудников, ФИО которых начинается на prefix.
+        При заданном prefix_index поиск идет по снимку в памяти, иначе - запросом к серверу.
+        Args:
+            prefix: Начало ФИО
+            gender: Необязательный фильтр по полу
+            limit: Максимальное количество строк
+        Returns:
+            list: Кортежи (id, full_name, birth_date, gender), отсортированные по full_name и id
+        """
+        if self.prefix_index is not None:
+            return self.prefix_index.search(prefix, gender=gender.title() if gender else None, limit=limit)
+
+        query, params = self.prefix_query(prefix, gender=gender, limit=limit)
+        return self.database.query_the_database(query=query, params=params, fetch=True,
+                                                use_cache=self.use_cache) or []
+
+    def find_employee_F(self):
+        """
+        Находит мужчин с фамилией на 'F' подготовленным выражением find_employee_f
+        (частный случай find_employees(gender="Male", surname_prefix="F"))
+        Returns:
+            list: Список найденных сотрудников
+        """
+        return self.database.execute_prepared(name="find_employee_f", fetch=True, use_cache=self.use_cache)
+
+    # Запрос с индексом и без один и тот же: индекс idx_gender_fullname создают и удаляют
+    # сценарии benchmark с этими именами (методы create_index и drop_index)
+    find_employee_F_without_index = find_employee_F
+    find_employee_F_with_index = find_employee_F
+
+
+# Поиск на 'F' выполняется подготовленным выражением: при сравнении индексов
+# время разбора и планирования не смешивается со временем самого поиска
+Database.register_statement("find_employee_f", EmployeeView.F_SEARCH_QUERY)
+
+
+class EmployeeStats:
+    """
+    Класс для отчетов по заранее посчитанной статистике сотрудников.
+
+    Таблица employee_stats хранит количество сотрудников по полу, году рождения и первой букве фамилии.
+    Она обновляется триггерами на уровне выражения с таблицами переходов: каждая вставка
+    (add_employee, COPY, INSERT ... VALUES), удаление, изменение и TRUNCATE меняет только
+    затронутые счетчики, поэтому отчеты читают несколько тысяч строк независимо от размера employees.
+    """
+    TABLE_QUERY = """
+        CREATE TABLE IF NOT EXISTS employee_stats (
+            gender VARCHAR(10) NOT NULL,
+            birth_year INTEGER NOT NULL,
+            surname_initial VARCHAR(1) NOT NULL,
+            cnt BIGINT NOT NULL,
+            PRIMARY KEY (gender, birth_year, surname_initial)
+        );
+    """
+    # Одна функция для вставки, удаления и изменения: ветка выбирается по TG_OP,
+    # таблицы переходов old_rows/new_rows объявляются в соответствующих триггерах.
+    # Ключи обновляются в порядке первичного ключа, чтобы параллельные загрузки не взаимоблокировались
+    FUNCTIONS_QUERY = """
+        CREATE OR REPLACE FUNCTION employee_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE employee_stats AS s SET cnt = s.cnt - d.cnt
+                FROM (SELECT gender, extract(year FROM birth_date)::int AS birth_year,
+                             left(full_name, 1) AS surname_initial, count(*) AS cnt
+                      FROM old_rows GROUP BY 1, 2, 3) AS d
+                WHERE s.gender = d.gender AND s.birth_year = d.birth_year
+                  AND s.surname_initial = d.surname_initial;
+                DELETE FROM employee_stats WHERE cnt <= 0;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO employee_stats AS s (gender, birth_year, surname_initial, cnt)
+                SELECT gender, extract(year FROM birth_date)::int, left(full_name, 1), count(*)
+                FROM new_rows GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+                ON CONFLICT (gender, birth_year, surname_initial) DO UPDATE SET cnt = s.cnt + EXCLUDED.cnt;
+            END IF;
+            RETURN NULL;
+        END $$;
+
+        CREATE OR REPLACE FUNCTION employee_stats_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            TRUNCATE employee_stats;
+            RETURN NULL;
+        END $$;
+    """
+    TRIGGERS_QUERY = """
+        DROP TRIGGER IF EXISTS employee_stats_insert ON employees;
+        DROP TRIGGER IF EXISTS employee_stats_delete ON employees;
+        DROP TRIGGER IF EXISTS employee_stats_update ON employees;
+        DROP TRIGGER IF EXISTS employee_stats_truncate ON employees;
+        CREATE TRIGGER employee_stats_insert AFTER INSERT ON employees
+            REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION employee_stats_apply();
+        CREATE TRIGGER employee_stats_delete AFTER DELETE ON employees
+            REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION employee_stats_apply();
+        CREATE TRIGGER employee_stats_update AFTER UPDATE ON employees
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION employee_stats_apply();
+        CREATE TRIGGER employee_stats_truncate AFTER TRUNCATE ON employees
+            FOR EACH STATEMENT EXECUTE FUNCTION employee_stats_truncate();
+    """
+    REBUILD_QUERY = """
+        TRUNCATE employee_stats;
+        INSERT INTO employee_stats (gender, birth_year, surname_initial, cnt)
+        SELECT gender, extract(year FROM birth_date)::int, left(full_name, 1), count(*)
+        FROM employees GROUP BY 1, 2, 3;
+    """
+    # Возраст в отчетах считается по году рождения, поэтому может быть на год больше точного
+    AGE_BANDS_QUERY = """
+        SELECT gender, (extract(year FROM current_date)::int - birth_year) / %s * %s AS band, sum(cnt)
+        FROM employee_stats GROUP BY 1, 2 ORDER BY 1, 2;
+    """
+    INITIALS_QUERY = """
+        SELECT surname_initial, sum(cnt) FILTER (WHERE gender = 'Male'),
+               sum(cnt) FILTER (WHERE gender = 'Female'), sum(cnt)
+        FROM employee_stats GROUP BY 1 ORDER BY 1;
+    """
+    YEARS_QUERY = """
+        SELECT birth_year, sum(cnt) FILTER (WHERE gender = 'Male'),
+               sum(cnt) FILTER (WHERE gender = 'Female'), sum(cnt)
+        FROM employee_stats GROUP BY 1 ORDER BY 1;
+    """
+    # Сверка со статистикой, посчитанной по всей таблице (полный проход, только для проверки)
+    VERIFY_QUERY = """
+        SELECT count(*) FROM (
+            SELECT gender, extract(year FROM birth_date)::int AS birth_year,
+                   left(full_name, 1) AS surname_initial, count(*) AS cnt
+            FROM employees GROUP BY 1, 2, 3
+        ) AS actual
+        FULL JOIN employee_stats AS s USING (gender, birth_year, surname_initial)
+        WHERE actual.cnt IS DISTINCT FROM s.cnt;
+    """
+
+    def __init__(self, database=None):
+        """
+        Args:
+            database: Объект Database; по умолчанию создается новый
+        """
+        self.database = database or Database()
+
+    def installed(self):
+        """Проверяет, создана ли таблица статистики"""
+        rows = self.database.query_the_database(query="SELECT to_regclass('employee_stats') IS NOT NULL;", fetch=True)
+        return bool(rows and rows[0][0])
+
+    def install(self):
+        """
+        Создает таблицу статистики, функции и триггеры и один раз заполняет таблицу по текущим данным.
+        Все выполняется одной транзакцией, поэтому вставки во время установки не теряются.
+        """
+        self.database.query_the_database(
+            query=self.TABLE_QUERY + self.FUNCTIONS_QUERY
+            + "LOCK TABLE employees IN SHARE ROW EXCLUSIVE MODE;" + self.TRIGGERS_QUERY + self.REBUILD_QUERY
+        )
+
+    def ensure_installed(self):
+        """Устанавливает статистику, если она еще не создана"""
+        if not self.installed():
+            print("Создание таблицы статистики по текущим данным...")
+            self.install()
+
+    def age_bands(self, *, band=10):
+        """
+        Количество сотрудников по полу и возрастным группам.
+        Args:
+            band: Ширина группы в годах
+        Returns:
+            list: Кортежи (пол, начало группы, количество)
+        """
+        return self.database.query_the_database(query=self.AGE_BANDS_QUERY, params=(band, band), fetch=True) or []
+
+    def surname_initials(self):
+        """
+        Количество сотрудников по первой букве фамилии.
+        Returns:
+            list: Кортежи (буква, мужчин, женщин, всего)
+        """
+        return self.database.query_the_database(query=self.INITIALS_QUERY, fetch=True) or []
+
+    def birth_years(self):
+        """
+        Количество сотрудников по году рождения.
+        Returns:
+            list: Кортежи (год, мужчин, женщин, всего)
+        """
+        return self.database.query_the_database(query=self.YEARS_QUERY, fetch=True) or []
+
+    def verify(self):
+        """
+        Сверяет статистику с полным подсчетом по таблице employees.
+        Returns:
+            int: Количество расхождений (0 - статистика верна) или None при ошибке
+        """
+        rows = self.database.query_the_database(query=self.VERIFY_QUERY, fetch=True)
+        return rows[0][0] if rows else None
+
+
+@register_scenario("find_employee_F_without_index")
+def _scenario_find_F_without_index(database):
+    """Сценарий benchmark: поиск мужчин с фамилией на 'F' без индекса"""
+    view = EmployeeView(database, use_cache=False)  # Замеряем сам запрос, а не кеш
+    state = {}
+
+    def setup():
+        # Индекс idx_fullname_id тоже удаляется: при collation "C" он обслуживает LIKE 'F%'
+        state["pagination_index"] = database.index_exists("idx_fullname_id")
+        database.drop_index()
+        database.drop_pagination_index()
+
+    def teardown():
+        if state.get("pagination_index"):
+            database.create_pagination_index()
+
+    return Scenario(
+        name="find_employee_F_without_index",
+        func=view.find_employee_F_without_index,
+        query=Database.execute_statement("find_employee_f"),
+        setup=setup,
+        teardown=teardown,
+        description="Мужчины с фамилией на F, индексы idx_gender_fullname и idx_fullname_id удалены",
+    )
+
+
+@register_scenario("find_employee_F_with_index")
+def _scenario_find_F_with_index(database):
+    """Сценарий benchmark: поиск мужчин с фамилией на 'F' с индексом"""
+    view = EmployeeView(database, use_cache=False)  # Замеряем сам запрос, а не кеш
+    return Scenario(
+        name="find_employee_F_with_index",
+        func=view.find_employee_F_with_index,
+        query=Database.execute_statement("find_employee_f"),
+        setup=database.create_index,
+        description="Мужчины с фамилией на F, индекс idx_gender_fullname создан",
+    )
+
+
+@register_scenario("find_employee_F_prefix_sql")
+def _scenario_find_F_prefix_sql(database):
+    """Сценарий benchmark: поиск мужчин с фамилией на 'F' через search_prefix запросом к серверу"""
+    view = EmployeeView(database, use_cache=False)
+    query, params = view.prefix_query("F", gender="Male")
+    return Scenario(
+        name="find_employee_F_prefix_sql",
+        func=lambda: view.search_prefix("F", gender="Male"),
+        query=query,
+        params=params,
+        description="Мужчины с фамилией на F через search_prefix, запрос к серверу",
+    )
+
+
+@register_scenario("find_employee_F_prefix_index")
+def _scenario_find_F_prefix_index(database):
+    """Сценарий benchmark: поиск мужчин с фамилией на 'F' по снимку PrefixIndex"""
+    index = PrefixIndex(database=database, chunk_size=stream_chunk_size)
+    view = EmployeeView(database, use_cache=False, prefix_index=index)
+    return Scenario(
+        name="find_employee_F_prefix_index",
+        func=lambda: view.search_prefix("F", gender="Male"),
+        setup=index.load,  # Загрузка снимка в замер не входит
+        description="Мужчины с фамилией на F через search_prefix, двоичный поиск в памяти процесса",
+    )
+
+
+@register_scenario("prefix_index_refresh")
+def _scenario_prefix_index_refresh(database):
+    """Сценарий benchmark: обновление снимка PrefixIndex без новых строк"""
+    index = PrefixIndex(database=database, chunk_size=stream_chunk_size)
+    return Scenario(
+        name="prefix_index_refresh",
+        func=index.refresh,
+        query=PrefixIndex.BOUNDS_QUERY,
+        setup=index.load,
+        description="Проверка диапазона id снимка PrefixIndex (стоимость поддержания актуальности)",
+    )
+
+
+def _validation_sample(size=100000):
+    """Возвращает столбцы строковых значений для сценариев проверки данных"""
+    rows = EmployeeManager.generate_batch_employees(batch_size=size, seed=1)
+    return ([row[0] for row in rows], [row[1].isoformat() for row in rows], [row[2] for row in rows])
+
+
+@register_scenario("validate_setters")
+def _scenario_validate_setters(database):
+    """Сценарий benchmark: проверка 100000 строк через сеттеры Employee"""
+    full_names, birth_dates, genders = _validation_sample()
+
+    def validate():
+        return [Employee(full_name=full_name, birth_date=birth_date, gender=gender)
+                for full_name, birth_date, gender in zip(full_names, birth_dates, genders)]
+
+    return Scenario(name="validate_setters", func=validate,
+                    description="100000 строк через конструктор и сеттеры Employee")
+
+
+@register_scenario("validate_many")
+def _scenario_validate_many(database):
+    """Сценарий benchmark: проверка 100000 строк через Employee.validate_many"""
+    full_names, birth_dates, genders = _validation_sample()
+
+    def validate():
+        return Employee.validate_many(full_names=full_names, birth_dates=birth_dates, genders=genders)[0]
+
+    return Scenario(name="validate_many", func=validate,
+                    description="100000 строк через Employee.validate_many и EmployeeRecord")
+
+
+def compare_search_performance(*, warmup=2, repeats=10):
+    """
+    Сравнивает производительность поиска сотрудников с индексом и без индекса
+    Выполняет один и тот же поисковый запрос:
+    сначала без индекса, затем с индексом, каждый раз с прогревом и серией замеров
+    Сравнивает медианное время выполнения, показывая разницу в производительности
+    Args:
+        warmup: Количество прогревочных запусков
+        repeats: Количество замеряемых запусков
     Returns:
         list: Результаты поиска с индексом
     """
     print("\n=== СРАВНЕНИЕ ПРОИЗВОДИТЕЛЬНОСТИ ПОИСКА ===")
-    db = Database()
     view = EmployeeView()
-
-    # Выполнение поиска без индекса
-    db.drop_index()
-    start_time = time.time()
-    result_without_index = view.find_employee_F_without_index()
-    time_without_index = time.time() - start_time
-
-    # Выполнение поиска с индексом
-    db.create_index()
-    start_time = time.time()
-    result_with_index = view.find_employee_F_with_index()
-    time_with_index = time.time() - start_time
+    runner = BenchmarkRunner(database=view.database, warmup=warmup, repeats=repeats)
+    results = runner.run(["find_employee_F_without_index", "find_employee_F_with_index"])
+    result_with_index = view.find_employee_F_with_index() or []
+    time_without_index, time_with_index = (result["stats"]["p50"] for result in results)
 
     # Сравнение результатов
     print("\n=== РЕЗУЛЬТАТЫ ОПТИМИЗАЦИИ ===")
-    print(f"Найдено сотрудников: {len(result_with_index)}")
-    print(f"Время без индекса: {time_without_index:.6f} секунд")
-    print(f"Время с индексом: {time_with_index:.6f} секунд")
+    runner.print_results(results)
+    print(f"\nНайдено сотрудников: {len(result_with_index)}")
+    print(f"Время без индекса (p50): {time_without_index:.6f} секунд")
+    print(f"Время с индексом (p50): {time_with_index:.6f} секунд")
+    for result in results:
+        if result["explain"]:
+            print(f"{result['name']}: планирование {result['explain']['planning_time_ms']:.3f} мс, "
+                  f"выполнение на сервере {result['explain']['execution_time_ms']:.3f} мс")
 
     return result_with_index
 
 
+# Варианты индексов для поиска мужчин с фамилией на 'F'.
+# query - запрос, который может использовать индекс (для индекса по выражению
+# условие записано через то же выражение), create - команды создания.
+INDEX_STRATEGIES = [
+    {
+        "name": "no_index",
+        "index": None,
+        "create": [],
+        "query": EmployeeView.F_SEARCH_QUERY,
+    },
+    {
+        "name": "btree_gender_fullname",
+        "index": "idx_exp_btree",
+        "create": ["CREATE INDEX idx_exp_btree ON employees (gender, full_name);"],
+        "query": EmployeeView.F_SEARCH_QUERY,
+    },
+    {
+        "name": "btree_text_pattern_ops",
+        "index": "idx_exp_pattern",
+        "create": ["CREATE INDEX idx_exp_pattern ON employees (gender, full_name text_pattern_ops);"],
+        "query": EmployeeView.F_SEARCH_QUERY,
+    },
+    {
+        "name": "partial_male",
+        "index": "idx_exp_partial_male",
+        "create": ["CREATE INDEX idx_exp_partial_male ON employees (full_name text_pattern_ops) "
+                   "WHERE gender = 'Male';"],
+        "query": EmployeeView.F_SEARCH_QUERY,
+    },
+    {
+        "name": "expression_surname",
+        "index": "idx_exp_surname",
+        "create": ["CREATE INDEX idx_exp_surname ON employees "
+                   "(gender, split_part(full_name, ' ', 1) text_pattern_ops);"],
+        "query": """
+            SELECT * FROM employees
+            WHERE gender = 'Male' AND split_part(full_name, ' ', 1) LIKE 'F%'
+            ORDER BY full_name;
+        """,
+    },
+    {
+        "name": "covering_include",
+        "index": "idx_exp_covering",
+        "create": ["CREATE INDEX idx_exp_covering ON employees (gender, full_name text_pattern_ops) "
+                   "INCLUDE (id, birth_date);"],
+        "query": EmployeeView.F_SEARCH_QUERY,
+    },
+    {
+        "name": "gin_trigram",
+        "index": "idx_exp_trgm",
+        "create": ["CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+                   "CREATE INDEX idx_exp_trgm ON employees USING gin (full_name gin_trgm_ops);"],
+        "query": EmployeeView.F_SEARCH_QUERY,
+    },
+]
+
+
+def compare_index_strategies(*, warmup=2, repeats=10, output=None):
+    """
+    Сравнивает варианты индексов для поиска мужчин с фамилией на 'F'
+    Для каждого варианта создает индекс (с замером времени построения),
+    выполняет серию замеров поиска, определяет размер индекса и удаляет его.
+    Индексы idx_gender_fullname и idx_fullname_id на время сравнения удаляются и затем восстанавливаются,
+    чтобы вариант no_index и остальные варианты замерялись без посторонних индексов по full_name.
+    Args:
+        warmup: Количество прогревочных запусков
+        repeats: Количество замеряемых запусков
+        output: Путь к JSON файлу отчета
+    Returns:
+        list: Результаты, отсортированные по медианному времени поиска
+    """
+    print("\n=== СРАВНЕНИЕ ВАРИАНТОВ ИНДЕКСОВ ===")
+    db = Database()
+    runner = BenchmarkRunner(database=db, warmup=warmup, repeats=repeats)
+    results = []
+
+    with db.session():
+        had_index = db.index_exists("idx_gender_fullname")
+        had_pagination_index = db.index_exists("idx_fullname_id")
+        db.drop_index()
+        db.drop_pagination_index()
+        # Карта видимости нужна для index-only scan у покрывающего индекса
+        db.run_maintenance(query="VACUUM ANALYZE employees;")
+
+        try:
+            for strategy in INDEX_STRATEGIES:
+                print(f"\n[index] {strategy['name']}")
+                start_time = time.perf_counter()
+                for query in strategy["create"]:
+                    db.query_the_database(query=query)
+                build_time = time.perf_counter() - start_time
+                if strategy["index"] and not db.index_exists(strategy["index"]):
+                    print(f"Индекс {strategy['index']} не создан, вариант пропущен")
+                    continue
+
+                try:
+                    result = runner.run_scenario(Scenario(
+                        name=strategy["name"],
+                        func=lambda query=strategy["query"]: db.query_the_database(query=query, fetch=True),
+                        query=strategy["query"],
+                    ))
+                    result["index"] = strategy["index"]
+                    result["index_size"] = db.index_size(strategy["index"]) if strategy["index"] else 0
+                    result["build_time"] = build_time if strategy["index"] else 0.0
+                    results.append(result)
+                finally:
+                    if strategy["index"]:
+                        db.query_the_database(query=f"DROP INDEX IF EXISTS {strategy['index']};")
+        finally:
+            if had_index:
+                db.create_index()
+            if had_pagination_index:
+                db.create_pagination_index()
+
+    results.sort(key=lambda result: result["stats"]["p50"])
+
+    print("\n{:<4} {:<24} {:>10} {:>10} {:>12} {:>12}  {}".format(
+        "№", "Вариант", "p50, мс", "p95, мс", "Размер, МБ", "Создание, с", "Чтение"))
+    print("-" * 110)
+    for place, result in enumerate(results, 1):
+        scans = ", ".join(result["explain"]["scans"]) if result["explain"] else "-"
+        print("{:<4} {:<24} {:>10.3f} {:>10.3f} {:>12.2f} {:>12.3f}  {}".format(
+            place, result["name"], result["stats"]["p50"] * 1000, result["stats"]["p95"] * 1000,
+            (result["index_size"] or 0) / 1024 / 1024, result["build_time"], scans))
+
+    if output:
+        runner.save(runner.report(results), output)
+
+    return results
+
+
+def run_benchmarks(*, names=None, warmup=2, repeats=10, output=None):
+    """
+    Запускает зарегистрированные сценарии и при необходимости сохраняет отчет в JSON
+    Args:
+        names: Список имен сценариев; None - все сценарии
+        warmup: Количество прогревочных запусков
+        repeats: Количество замеряемых запусков
+        output: Путь к JSON файлу отчета
+    Returns:
+        dict: Отчет о запуске
+    """
+    runner = BenchmarkRunner(database=Database(), warmup=warmup, repeats=repeats)
+    results = runner.run(names)
+    runner.print_results(results)
+    report = runner.report(results)
+    if output:
+        runner.save(report, output)
+    return report
+
+
+def compare_age_calculation(*, sample_size=100000):
+    """
+    Сравнивает способы расчета возраста на выборке сотрудников:
+    построчный Employee.calculate_age, пакетный Employee.calculate_ages
+    и расчет на стороне PostgreSQL
+    Args:
+        sample_size: Количество строк в выборке
+    Returns:
+        dict: Время в секундах для каждого способа
+    """
+    print("\n=== СРАВНЕНИЕ СПОСОБОВ РАСЧЕТА ВОЗРАСТА ===")
+    view = EmployeeView()
+    rows = view.database.query_the_database(
+        query=f"SELECT birth_date FROM employees LIMIT {int(sample_size)};", fetch=True) or []
+    birth_dates = [row[0] for row in rows]
+
+    start_time = time.perf_counter()
+    for birth_date in birth_dates:
+        Employee.calculate_age(birth_date=birth_date)
+    time_per_row = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    Employee.calculate_ages(birth_dates=birth_dates)
+    time_batch = time.perf_counter() - start_time
+
+    # Для сравнения с SQL учитываем и чтение строк: это полный путь до вывода
+    timings = view.measure_age_sources(sample_size=sample_size)
+
+    print(f"Строк в выборке: {len(birth_dates)}")
+    print(f"Построчно (calculate_age): {time_per_row:.6f} секунд")
+    print(f"Пакетно (calculate_ages): {time_batch:.6f} секунд")
+    print(f"Чтение + пакетный расчет на клиенте: {timings['python']:.6f} секунд")
+    print(f"Чтение + расчет в PostgreSQL: {timings['sql']:.6f} секунд")
+    print(f"Быстрее: {min(timings, key=timings.get)}")
+
+    return {"per_row": time_per_row, "batch": time_batch, **timings}
+
+
+# Запросы нагрузочного теста в синтаксисе asyncpg ($1, $2, ...)
+ASYNC_OPERATIONS = {
+    "search": EmployeeView.F_SEARCH_QUERY,
+    "insert": "INSERT INTO employees (full_name, birth_date, gender) VALUES ($1, $2, $3)",
+}
+
+
+def run_async_load_test(*, operation="search", requests=1000, concurrency=async_concurrency,
+                        pool_size=async_pool_max_size):
+    """
+    Нагрузочный тест на асинхронном пуле: requests независимых поисков мужчин с фамилией на 'F'
+    или вставок по одному сотруднику, не более concurrency одновременно.
+    Args:
+        operation: "search" или "insert"
+        requests: Общее количество запросов
+        concurrency: Количество одновременно выполняемых запросов
+        pool_size: Максимальный размер пула соединений
+    Returns:
+        dict: Результат async_db.load_test
+    """
+    if operation not in ASYNC_OPERATIONS:
+        raise ValueError(f"Неизвестная операция {operation}, доступные: {', '.join(ASYNC_OPERATIONS)}")
+    query = ASYNC_OPERATIONS[operation]
+    rows = EmployeeManager.generate_batch_employees(batch_size=requests) if operation == "insert" else None
+
+    async def run():
+        async with AsyncDatabase(host=host, user=user, password=password, database=db_name,
+                                 max_size=pool_size, concurrency=concurrency, metrics=Database.metrics) as db:
+            if rows is None:
+                async def execute(index):
+                    await db.fetch(query)
+            else:
+                async def execute(index):
+                    await db.execute(query, *rows[index])
+            return await load_test(execute, requests=requests, concurrency=concurrency)
+
+    print(f"\n=== НАГРУЗОЧНЫЙ ТЕСТ: {operation}, запросов {requests}, одновременно {concurrency}, "
+          f"пул {pool_size} ===")
+    result = asyncio.run(run())
+    if operation == "insert":
+        Database.invalidate_cache()
+
+    latency = result["latency"]
+    print(f"Выполнено: {result['requests'] - result['errors']}, ошибок: {result['errors']}")
+    print(f"Общее время: {result['elapsed']:.3f} секунд, пропускная способность: "
+          f"{result['throughput'] or 0:.1f} запросов/с")
+    if latency["count"]:
+        print("Задержка, мс: p50 {:.3f}, p95 {:.3f}, p99 {:.3f}, max {:.3f}".format(
+            latency["p50"] * 1000, latency["p95"] * 1000, latency["p99"] * 1000, latency["max"] * 1000))
+    return result
+
+
+def print_cache_stats():
+    """Выводит счетчики кеша результатов, если он включен"""
+    if Database.cache is None:
+        return
+    stats = Database.cache.stats()
+    print(f"[cache] попаданий: {stats['hits']}, промахов: {stats['misses']}, "
+          f"доля попаданий: {stats['hit_rate']:.1%}, записей: {stats['entries']}, "
+          f"объем: {stats['bytes'] / 1024:.1f} КБ, вытеснено: {stats['evictions']}, сбросов: {stats['invalidations']}")
+
+
+def run_command(line, run_mode):
+    """
+    Выполняет одну команду долгоживущего процесса и выводит время ее выполнения.
+    Args:
+        line: Строка команды, например "5" или "2 \"Ivanov Ivan Ivanovich\" 1985-03-15 Male"
+        run_mode: Функция (режим, аргументы), выполняющая режим
+    Returns:
+        bool: False, если получена команда завершения
+    """
+    try:
+        words = shlex.split(line)
+    except ValueError as e:
+        print(f"Не удалось разобрать команду: {e}")
+        return True
+    if not words:
+        return True
+    if words[0] in ("exit", "quit"):
+        return False
+
+    start_time = time.perf_counter()
+    try:
+        if words[0] == "cache":
+            print_cache_stats()
+        else:
+            run_mode(words[0], words[1:])
+    except Exception as e:
+        # Ошибка одной команды не должна останавливать процесс с прогретым пулом
+        logger.error(f"Команда завершилась ошибкой: {e}")
+    print(f"[*] Команда выполнена за {time.perf_counter() - start_time:.6f} секунд.", flush=True)
+    return True
+
+
+def serve_stdin(run_mode):
+    """Читает команды из стандартного ввода, пока он не закончится или не придет exit"""
+    interactive = sys.stdin.isatty()
+    while True:
+        if interactive:
+            print("> ", end="", flush=True)
+        line = sys.stdin.readline()
+        if not line or not run_command(line, run_mode):
+            break
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    """
+    Обработчик подключения к Unix сокету: каждая строка - команда,
+    вывод команды возвращается клиенту через то же подключение
+    """
+
+    def handle(self):
+        output = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+        try:
+            with redirect_stdout(output):
+                for raw_line in self.rfile:
+                    if not run_command(raw_line.decode("utf-8"), self.server.run_mode):
+                        break
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("Клиент отключился")
+        finally:
+            output.detach()
+
+
+def serve_socket(path, run_mode):
+    """
+    Принимает команды через локальный Unix сокет.
+    Подключения обслуживаются по очереди, поэтому команды не конкурируют за пул и кеш.
+    Args:
+        path: Путь к файлу сокета
+        run_mode: Функция (режим, аргументы), выполняющая режим
+    """
+    # Удаляем только сокет, оставшийся от предыдущего запуска; любой другой файл не трогаем
+    try:
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            print(f"Путь {path} уже занят и не является сокетом")
+            return
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+    with socketserver.UnixStreamServer(path, CommandHandler) as server:
+        server.run_mode = run_mode
+        logger.info(f"Ожидание команд на сокете {path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Сервер остановлен")
+        finally:
+            os.unlink(path)
+
+
 def start_app():
     """Точка входа приложения при запуске через командную строку"""
-    import sys
-
     # Определяем функции для каждого режима работы
     def create_table():
         """Режим 1: Создание таблицы"""
         print("Создание таблицы сотрудников")
-        Database().create_table()
+        database = Database()
+        database.create_table()
+        # Индекс постраничного просмотра (режим 11) создается один раз вместе с таблицей
+        database.create_pagination_index()
         print("Таблица успешно создана.")
 
     def add_employee(args):
@@ -488,22 +2909,32 @@ def start_app():
         if age is not None:
             print(f"Сотрудник {full_name} успешно добавлен. Возраст: {age} лет.")
 
-    def display_employees():
+    def display_employees(args):
         """Режим 3: Просмотр всех сотрудников"""
-        EmployeeView().display_employees_with_age()
+        # Необязательный аргумент: количество строк, получаемых с сервера за один раз
+        chunk_size = int(args[0]) if args else stream_chunk_size
+        # Второй аргумент - способ расчета возраста: python, sql или auto
+        age_source = args[1] if len(args) > 1 else "auto"
+        EmployeeView().display_employees_with_age(chunk_size=chunk_size, age_source=age_source)
 
-    def add_million_employees():
+    def add_million_employees(args):
         """Режим 4: Массовое добавление данных"""
-        print("Начинаем добавление 1,000,000 сотрудников...")
-        EmployeeManager().add_one_million_employees()
+        # Необязательные аргументы: стратегия загрузки (copy/values), seed генератора,
+        # количество процессов и общее количество сотрудников
+        strategy = args[0] if len(args) > 0 else "copy"
+        seed = int(args[1]) if len(args) > 1 and args[1] != "-" else None
+        workers = int(args[2]) if len(args) > 2 else 1
+        total = int(args[3]) if len(args) > 3 else 1000000
+        print(f"Начинаем добавление {total:,} сотрудников...")
+        EmployeeManager().add_one_million_employees(strategy=strategy, seed=seed, workers=workers, total=total)
 
     def test_search_speed():
         """Режим 5: Тестирование скорости поиска"""
         print("Поиск сотрудников мужского пола с фамилией на 'F'")
-        db = Database()
-        db.drop_index()  # Удаляем индекс
         view = EmployeeView()
-        result = view.find_employee_F_without_index()
+        runner = BenchmarkRunner(database=view.database, explain=False)
+        runner.print_results(runner.run(["find_employee_F_without_index"]))  # Замер без индекса
+        result = view.find_employee_F_without_index() or []
 
         print(f"Найдено {len(result)} сотрудников.")
 
@@ -517,19 +2948,266 @@ def start_app():
                     emp[0], emp[1], emp[2].strftime("%Y-%m-%d"), emp[3]))
             if len(result) > 10:
                 print(f"... и еще {len(result) - 10} записей")
+        print_cache_stats()
 
     def optimize_search():
         """Режим 6: Оптимизация поиска"""
         compare_search_performance()
+        print_cache_stats()
+
+    def compare_age():
+        """Режим 7: Сравнение способов расчета возраста"""
+        compare_age_calculation()
+
+    def benchmark_queries(args):
+        """Режим 8: Замеры производительности сценариев"""
+        # Аргументы: количество замеров, путь к JSON отчету, имена сценариев
+        repeats = int(args[0]) if len(args) > 0 else 10
+        output = args[1] if len(args) > 1 and args[1] != "-" else None
+        names = args[2:] or None
+        run_benchmarks(names=names, repeats=repeats, output=output)
+
+    def import_employees(args):
+        """Режим 10: Импорт сотрудников из CSV/JSONL файла"""
+        if not args:
+            print("Не указан файл для импорта.")
+            print("Пример: python main.py 10 employees.csv [rejects.csv] [copy|values]")
+            return
+        rejects_path = args[1] if len(args) > 1 and args[1] != "-" else None
+        strategy = args[2] if len(args) > 2 else "copy"
+        try:
+            EmployeeImporter(strategy=strategy).import_file(args[0], rejects_path=rejects_path)
+        except (OSError, ValueError) as e:
+            print(f"Не удалось импортировать файл: {e}")
+
+    def browse_employees(args):
+        """Режим 11: Постраничный просмотр сотрудников"""
+        # Аргументы: размер страницы, токен страницы, пол, начало ФИО ("-" - не задано)
+        values = [arg if arg != "-" else None for arg in args]
+        page_size = int(values[0]) if len(values) > 0 and values[0] else 20
+        cursor = values[1] if len(values) > 1 else None
+        gender = values[2] if len(values) > 2 else None
+        prefix = values[3] if len(values) > 3 else None
+
+        view = EmployeeView()
+        try:
+            page = view.get_page(page_size=page_size, cursor=cursor, gender=gender, prefix=prefix)
+        except ValueError as e:
+            print(e)
+            return
+
+        if not page["rows"]:
+            print("На странице нет сотрудников")
+            return
+
+        print("\n{:<8} {:<35} {:<15} {:<10}".format("ID", "ФИО", "Дата рождения", "Пол"))
+        print("-" * 70)
+        for emp_id, full_name, birth_date, gender_value in page["rows"]:
+            print("{:<8} {:<35} {:<15} {:<10}".format(emp_id, full_name, birth_date.strftime("%Y-%m-%d"), gender_value))
+        print(f"\nСледующая страница: {page['next_cursor'] or '-'}")
+        print(f"Предыдущая страница: {page['prev_cursor'] or '-'}")
+
+    def export_employees(args):
+        """Режим 12: Выгрузка сотрудников в файл"""
+        if not args:
+            print("Не указан файл для выгрузки.")
+            print("Пример: python main.py 12 employees.csv [csv|jsonl|parquet] [all|f]")
+            return
+        path = args[0]
+        file_format = args[1] if len(args) > 1 and args[1] != "-" else None
+        subset = args[2] if len(args) > 2 else "all"
+
+        start_time = time.perf_counter()
+        try:
+            exported = EmployeeExporter().export(path=path, file_format=file_format, subset=subset)
+        except (OSError, ValueError) as e:
+            print(f"Не удалось выгрузить сотрудников: {e}", file=sys.stderr)
+            return
+        # Сводка идет в stderr, чтобы не смешиваться с данными при выгрузке в stdout
+        print(f"Выгружено сотрудников: {exported}", file=sys.stderr)
+        print(f"[*] Время выгрузки: {time.perf_counter() - start_time:.6f} секунд.", file=sys.stderr)
+
+    def load_profile(args):
+        """Режим 14: Загрузка набора данных по профилю"""
+        if not args:
+            print("Доступные профили:")
+            for name, params in PROFILES.items():
+                print(f"  {name}: " + ", ".join(f"{key}={value}" for key, value in params.items()))
+            print("Пример: python main.py 14 skewed rows=5000000 zipf=1.2 f_selectivity=0.02 seed=42 workers=4")
+            return
+
+        # Параметры профиля и загрузки в виде ключ=значение
+        options = dict(arg.split("=", 1) for arg in args[1:] if "=" in arg)
+        strategy = options.pop("strategy", "copy")
+        workers = int(options.pop("workers", 1))
+        try:
+            profile = DatasetProfile.from_preset(args[0], **options)
+            EmployeeManager().load_profile(profile, strategy=strategy, workers=workers)
+        except (TypeError, ValueError, RuntimeError) as e:
+            print(f"Не удалось загрузить набор данных: {e}")
+
+    def reload_table(args):
+        """Режим 15: Перезагрузка таблицы сотрудников"""
+        # Аргументы: действие (reload/reset/compare), количество сотрудников, стратегия, seed, процессы
+        action = args[0] if len(args) > 0 else "reload"
+        total = int(args[1]) if len(args) > 1 else 1000000
+        strategy = args[2] if len(args) > 2 else "copy"
+        seed = int(args[3]) if len(args) > 3 and args[3] != "-" else None
+        workers = int(args[4]) if len(args) > 4 else 1
+        manager = EmployeeManager()
+
+        try:
+            if action == "reset":
+                start_time = time.perf_counter()
+                manager.database.clear_table(truncate=True)
+                print(f"[*] Время TRUNCATE: {time.perf_counter() - start_time:.6f} секунд.")
+            elif action == "reload":
+                timings = manager.reload_employees(count=total - 100, f_count=100, strategy=strategy, seed=seed,
+                                                   workers=workers)
+                print(f"Готово! Загружено {timings['rows']} сотрудников.")
+                print("[*] Время этапов: " + ", ".join(
+                    f"{phase} {seconds:.3f} с" for phase, seconds in timings.items() if phase != "rows"))
+            elif action == "compare":
+                manager.compare_reload_paths(total=total, strategy=strategy, seed=seed, workers=workers)
+            else:
+                print(f"Неизвестное действие: {action}. Доступные: reload, reset, compare")
+        except (RuntimeError, ValueError) as e:
+            print(f"Не удалось перезагрузить таблицу: {e}")
+
+    def show_stats(args):
+        """Режим 16: Отчеты по заранее посчитанной статистике"""
+        # Аргументы: отчет (age/initials/years/install/verify) и ширина возрастной группы
+        report = args[0] if args else "age"
+        stats = EmployeeStats()
+
+        start_time = time.perf_counter()
+        if report == "install":
+            stats.install()
+            print("Статистика создана и заполнена по текущим данным.")
+        elif report == "verify":
+            stats.ensure_installed()
+            mismatches = stats.verify()
+            print("Статистика совпадает с таблицей." if mismatches == 0 else f"Расхождений: {mismatches}")
+        elif report == "age":
+            stats.ensure_installed()
+            band = int(args[1]) if len(args) > 1 else 10
+            print("\n{:<10} {:<12} {:>12}".format("Пол", "Возраст", "Сотрудников"))
+            print("-" * 36)
+            for gender, start, cnt in stats.age_bands(band=band):
+                print("{:<10} {:<12} {:>12}".format(gender, f"{start}-{start + band - 1}", cnt))
+        elif report in ("initials", "years"):
+            stats.ensure_installed()
+            rows = stats.surname_initials() if report == "initials" else stats.birth_years()
+            title = "Буква" if report == "initials" else "Год"
+            print("\n{:<8} {:>12} {:>12} {:>12}".format(title, "Мужчин", "Женщин", "Всего"))
+            print("-" * 47)
+            for key, males, females, total in rows:
+                print("{:<8} {:>12} {:>12} {:>12}".format(key, males or 0, females or 0, total))
+        else:
+            print(f"Неизвестный отчет: {report}. Доступные: age, initials, years, install, verify")
+            return
+        print(f"[*] Время: {time.perf_counter() - start_time:.6f} секунд.")
+
+    def async_load_test(args):
+        """Режим 17: Нагрузочный тест на асинхронном пуле"""
+        # Аргументы: операция (search/insert), количество запросов, одновременных запросов, размер пула
+        operation = args[0] if len(args) > 0 else "search"
+        requests = int(args[1]) if len(args) > 1 else 1000
+        concurrency = int(args[2]) if len(args) > 2 else async_concurrency
+        pool_size = int(args[3]) if len(args) > 3 else async_pool_max_size
+        try:
+            run_async_load_test(operation=operation, requests=requests, concurrency=concurrency,
+                                pool_size=pool_size)
+        except (RuntimeError, ValueError, OSError) as e:
+            print(f"Не удалось выполнить нагрузочный тест: {e}")
+
+    def find_employees(args):
+        """Режим 18: Поиск сотрудников по фильтрам"""
+        # Аргументы: пол, начало фамилии, дата рождения с, по, количество строк ("-" - не задано)
+        values = [arg if arg != "-" else None for arg in args]
+        values += [None] * (5 - len(values))
+        gender, surname_prefix, birth_from, birth_to, limit = values[:5]
+        try:
+            limit = int(limit) if limit else 100
+        except ValueError:
+            print(f"Количество строк должно быть числом: {limit}")
+            return
+        filters = {"gender": gender, "surname_prefix": surname_prefix, "birth_from": birth_from,
+                   "birth_to": birth_to, "limit": limit}
+
+        view = EmployeeView(use_cache=False)
+        start_time = time.perf_counter()
+        try:
+            result = view.find_employees(**filters)
+        except ValueError as e:
+            print(e)
+            return
+        search_time = time.perf_counter() - start_time
+
+        print("\n{:<8} {:<35} {:<15} {:<10}".format("ID", "ФИО", "Дата рождения", "Пол"))
+        print("-" * 70)
+        for emp_id, full_name, birth_date, gender_value in result:
+            print("{:<8} {:<35} {:<15} {:<10}".format(emp_id, full_name, birth_date.strftime("%Y-%m-%d"), gender_value))
+        print(f"\nНайдено: {len(result)} (не больше {filters['limit']})")
+        print(f"[*] Время поиска: {search_time:.6f} секунд.")
+
+        plan = view.explain_search(**filters)
+        if plan:
+            print(f"Чтение: {', '.join(plan['scans']) or '-'}")
+            print(f"Использованные индексы: {', '.join(plan['used']) or 'нет'}")
+            print(f"Индексы таблицы: {', '.join(plan['available']) or 'нет'}")
+            for hint in plan["hints"]:
+                print(f"Подсказка: {hint}")
+
+    def serve(args):
+        """Режим 13: Долгоживущий процесс, принимающий команды режимов"""
+        # Необязательный аргумент - путь к Unix сокету; без него команды читаются из stdin.
+        # Пул соединений создается при первой команде, кеш результатов включается сразу,
+        # даже если в config.py он выключен: оба живут до завершения процесса
+        if Database.cache is None:
+            Database.enable_cache()
+        if args:
+            serve_socket(args[0], run_mode)
+        else:
+            serve_stdin(run_mode)
+
+    def run_mode(mode, args):
+        """Выполняет режим с аргументами; используется при обычном запуске и в режиме 13"""
+        if mode not in modes or mode == "13":
+            print(f"Неизвестный режим: {mode}")
+            return
+        if modes[mode].get("args"):  # Режимы с дополнительными аргументами
+            modes[mode]["func"](args)
+        else:
+            modes[mode]["func"]()
+
+    def compare_indexes(args):
+        """Режим 9: Сравнение вариантов индексов"""
+        # Аргументы: количество замеров, путь к JSON отчету
+        repeats = int(args[0]) if len(args) > 0 else 10
+        output = args[1] if len(args) > 1 else None
+        compare_index_strategies(repeats=repeats, output=output)
 
     # Словарь с доступными режимами и соответствующими функциями
     modes = {
         "1": {"func": create_table, "desc": "Создание таблицы"},
-        "2": {"func": add_employee, "desc": "Добавление сотрудника"},
-        "3": {"func": display_employees, "desc": "Просмотр всех сотрудников"},
-        "4": {"func": add_million_employees, "desc": "Массовое добавление данных"},
+        "2": {"func": add_employee, "desc": "Добавление сотрудника", "args": True},
+        "3": {"func": display_employees, "desc": "Просмотр всех сотрудников", "args": True},
+        "4": {"func": add_million_employees, "desc": "Массовое добавление данных", "args": True},
         "5": {"func": test_search_speed, "desc": "Тестирование скорости поиска"},
         "6": {"func": optimize_search, "desc": "Оптимизация поиска"},
+        "7": {"func": compare_age, "desc": "Сравнение способов расчета возраста"},
+        "8": {"func": benchmark_queries, "desc": "Замеры производительности запросов", "args": True},
+        "9": {"func": compare_indexes, "desc": "Сравнение вариантов индексов", "args": True},
+        "10": {"func": import_employees, "desc": "Импорт сотрудников из CSV/JSONL", "args": True},
+        "11": {"func": browse_employees, "desc": "Постраничный просмотр сотрудников", "args": True},
+        "12": {"func": export_employees, "desc": "Выгрузка сотрудников в CSV/JSONL/Parquet", "args": True},
+        "13": {"func": serve, "desc": "Интерактивный режим / сервер команд", "args": True},
+        "14": {"func": load_profile, "desc": "Загрузка набора данных по профилю", "args": True},
+        "15": {"func": reload_table, "desc": "Перезагрузка таблицы (staging, TRUNCATE, сравнение)", "args": True},
+        "16": {"func": show_stats, "desc": "Статистика по полу, возрасту и первой букве фамилии", "args": True},
+        "17": {"func": async_load_test, "desc": "Нагрузочный тест на асинхронном пуле", "args": True},
+        "18": {"func": find_employees, "desc": "Поиск сотрудников по полу, фамилии и дате рождения", "args": True},
     }
 
     # Показываем справку, если не указан режим
@@ -550,11 +3228,18 @@ def start_app():
         print("Доступные режимы: " + ", ".join(modes.keys()))
         return
 
+    logging.basicConfig(level=log_level, format="%(message)s")
+
     # Запускаем соответствующую функцию
-    if mode == "2":  # Для добавления сотрудника нужны дополнительные аргументы
-        modes[mode]["func"](sys.argv[2:])
-    else:
-        modes[mode]["func"]()
+    try:
+        if mode == "13":
+            serve(sys.argv[2:])
+        else:
+            run_mode(mode, sys.argv[2:])
+    finally:
+        Database.close_pool()
+        if metrics_file:
+            Database.metrics.write_prometheus(metrics_file)
 
 if __name__ == "__main__":
     start_app()
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Инструментирование запросов к базе данных.
+
+QueryMetrics собирает гистограммы времени по этапам выполнения запроса
+(connect, execute, fetch, commit) отдельно для каждого выражения (метка -
+ключевое слово и отпечаток текста запроса),
+считает строки и ошибки, пишет медленные запросы в структурированный лог
+(JSON lines) и умеет выгружать счетчики в текстовом формате Prometheus.
+"""
+import hashlib
+import json
+import time
+from datetime import datetime
+from threading import Lock
+
+# Границы корзин гистограммы в секундах
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+PHASES = ("connect", "execute", "fetch", "commit")
+
+
+def normalize_query(query):
+    """Возвращает текст запроса с пробелами, сжатыми до одного, и без завершающей точки с запятой"""
+    return " ".join(query.split()).rstrip(";").rstrip()
+
+
+def statement_label(query):
+    """
+    Возвращает метку выражения для группировки метрик.
+    Для подготовленных выражений - "execute:<имя>", для остальных - первое слово запроса
+    и отпечаток нормализованного текста, чтобы разные запросы не попадали в одну гистограмму.
+    Args:
+        query: Строка SQL запроса
+    Returns:
+        str: Метка, например "select:1a2b3c4d", "copy:5e6f7a8b" или "execute:find_employee_f"
+    """
+    words = query.split(None, 2)
+    if not words:
+        return "empty"
+    keyword = words[0].lower()
+    if keyword == "execute" and len(words) > 1:
+        return f"execute:{words[1].split('(')[0]}"
+    fingerprint = hashlib.blake2b(normalize_query(query).encode(), digest_size=4).hexdigest()
+    return f"{keyword}:{fingerprint}"
+
+
+def _escape_label(value):
+    """Экранирует значение метки для текстового формата Prometheus"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными корзинами в стиле Prometheus
+    """
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Добавляет наблюдение в первую подходящую корзину"""
+        for index, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        """Возвращает накопленные значения корзин, как требует формат Prometheus"""
+        result = []
+        running = 0
+        for bucket_count in self.counts:
+            running += bucket_count
+            result.append(running)
+        return result
+
+
+class QueryMetrics:
+    """
+    Сборщик метрик запросов: гистограммы по этапам, строки, ошибки и лог медленных запросов
+    """
+
+    def __init__(self, *, slow_query_threshold=None, slow_query_log=None):
+        """
+        Args:
+            slow_query_threshold: Порог в секундах, начиная с которого запрос считается медленным;
+                                  None - не записывать медленные запросы
+            slow_query_log: Путь к файлу лога медленных запросов (JSON lines)
+        """
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_query_log = slow_query_log
+        self.histograms = {}  # (метка, этап) -> Histogram
+        self.statements = {}  # метка -> нормализованный текст запроса
+        self.rows = {}
+        self.errors = {}
+        self.slow_queries = 0
+        self._lock = Lock()
+
+    def observe(self, label, phase, seconds):
+        """
+        Учитывает время одного этапа.
+        Args:
+            label: Метка выражения из statement_label
+            phase: Один из PHASES
+            seconds: Длительность этапа
+        """
+        with self._lock:
+            histogram = self.histograms.get((label, phase))
+            if histogram is None:
+                histogram = self.histograms[(label, phase)] = Histogram()
+            histogram.observe(seconds)
+
+    def record(self, *, query, params=None, phases, rows=None, error=None, label=None):
+        """
+        Учитывает выполненный запрос целиком и при превышении порога пишет его в лог медленных запросов.
+        Args:
+            query: Строка SQL запроса
+            params: Параметры запроса (в лог попадает их сокращенное представление)
+            phases: Словарь этап -> длительность в секундах
+            rows: Количество полученных или измененных строк
+            error: Текст ошибки, если запрос не выполнен
+            label: Явная метка выражения; по умолчанию statement_label(query)
+        """
+        label = label or statement_label(query)
+        for phase, seconds in phases.items():
+            self.observe(label, phase, seconds)
+
+        with self._lock:
+            if label not in self.statements:
+                self.statements[label] = normalize_query(query)
+            if rows is not None and rows >= 0:
+                self.rows[label] = self.rows.get(label, 0) + rows
+            if error is not None:
+                self.errors[label] = self.errors.get(label, 0) + 1
+
+        duration = sum(phases.values())
+        if self.slow_query_threshold is not None and duration >= self.slow_query_threshold:
+            self.log_slow_query(query=query, params=params, label=label, duration=duration,
+                                phases=phases, rows=rows, error=error)
+
+    def log_slow_query(self, *, query, params, label, duration, phases, rows, error):
+        """Записывает медленный запрос в лог отдельной JSON строкой"""
+        with self._lock:
+            self.slow_queries += 1
+            if not self.slow_query_log:
+                return
+            entry = {
+                "ts": datetime.now().isoformat(timespec="milliseconds"),
+                "statement": label,
+                "duration": round(duration, 6),
+                "phases": {phase: round(seconds, 6) for phase, seconds in phases.items()},
+                "rows": rows,
+                "error": error,
+                "query": normalize_query(query),
+                "params": None if params is None else repr(params)[:200],
+            }
+            with open(self.slow_query_log, "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def to_prometheus(self, prefix="employees"):
+        """
+        Формирует текст метрик в формате Prometheus.
+        Returns:
+            str: Текст для файла или textfile collector node_exporter
+        """
+        lines = [
+            f"# HELP {prefix}_query_duration_seconds Время этапов выполнения SQL запросов",
+            f"# TYPE {prefix}_query_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (label, phase), histogram in sorted(self.histograms.items()):
+                labels = f'statement="{label}",phase="{phase}"'
+                for bound, value in zip(BUCKETS, histogram.cumulative()):
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{prefix}_query_duration_seconds_bucket{{{labels},le="{le}"}} {value}')
+                lines.append(f"{prefix}_query_duration_seconds_sum{{{labels}}} {histogram.total}")
+                lines.append(f"{prefix}_query_duration_seconds_count{{{labels}}} {histogram.count}")
+
+            lines.append(f"# HELP {prefix}_query_rows_total Количество полученных или измененных строк")
+            lines.append(f"# TYPE {prefix}_query_rows_total counter")
+            for label, value in sorted(self.rows.items()):
+                lines.append(f'{prefix}_query_rows_total{{statement="{label}"}} {value}')
+
+            lines.append(f"# HELP {prefix}_query_errors_total Количество запросов, завершившихся ошибкой")
+            lines.append(f"# TYPE {prefix}_query_errors_total counter")
+            for label, value in sorted(self.errors.items()):
+                lines.append(f'{prefix}_query_errors_total{{statement="{label}"}} {value}')
+
+            lines.append(f"# HELP {prefix}_statement_info Текст запроса для каждой метки statement")
+            lines.append(f"# TYPE {prefix}_statement_info gauge")
+            for label, query in sorted(self.statements.items()):
+                lines.append(f'{prefix}_statement_info{{statement="{label}",query="{_escape_label(query)}"}} 1')
+
+            lines.append(f"# HELP {prefix}_slow_queries_total Количество медленных запросов")
+            lines.append(f"# TYPE {prefix}_slow_queries_total counter")
+            lines.append(f"{prefix}_slow_queries_total {self.slow_queries}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Записывает метрики в файл в формате Prometheus"""
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
+
+    def summary(self):
+        """
+        Возвращает сводку по меткам: количество запросов и суммарное время каждого этапа.
+        Текст запроса для метки хранится в self.statements.
+        Returns:
+            dict: метка -> {этап: {"count", "total"}}
+        """
+        with self._lock:
+            result = {}
+            for (label, phase), histogram in self.histograms.items():
+                result.setdefault(label, {})[phase] = {"count": histogram.count, "total": histogram.total}
+            return result
+
+
+class Timer:
+    """
+    Контекстный менеджер для замера одного этапа: with Timer(phases, "execute"): ...
+    """
+
+    def __init__(self, phases, phase):
+        self.phases = phases
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.phases[self.phase] = self.phases.get(self.phase, 0.0) + time.perf_counter() - self.start
+        return False
@@ -0,0 +1,250 @@
+"""
+Снимок таблицы сотрудников в памяти процесса для поиска по началу ФИО.
+
+Строки (id, full_name, birth_date, gender) загружаются один раз и хранятся
+по полу в компактных отсортированных массивах: ФИО склеены в один bytes со
+смещениями, id и даты рождения - в array. Поиск по префиксу выполняется
+двоичным поиском без обращения к серверу. Обновление инкрементальное:
+дочитываются только строки с id больше последнего загруженного (watermark).
+
+Порядок строк - по кодам символов (как collation "C") и затем по id.
+Последовательность id при очистке и перезагрузке таблицы не сбрасывается,
+поэтому перезагрузка обнаруживается по изменившемуся минимальному id.
+Изменения существующих строк (UPDATE) снимок не видит; удаление строк
+из середины таблицы обнаруживается только при refresh(verify=True).
+В обоих случаях снимок загружается полностью.
+"""
+import heapq
+from array import array
+from bisect import bisect_left, insort
+from datetime import date
+
+# Символ, больший любого символа ФИО: верхняя граница диапазона префикса
+_MAX_CHAR = "\U0010ffff"
+
+
+class _SortedNames:
+    """
+    Последовательность ФИО поверх склеенного bytes для bisect без создания списка строк
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.blob[self.offsets[index]:self.offsets[index + 1]]
+
+
+class _Partition:
+    """
+    Строки одного пола: отсортированная основная часть и небольшая добавочная часть,
+    в которую попадают строки инкрементальных обновлений до следующего уплотнения
+    """
+
+    def __init__(self):
+        self.blob = b""
+        self.offsets = array("q", [0])
+        self.ids = array("q")
+        self.birth_days = array("l")  # date.toordinal()
+        self.delta = []  # Отсортированный список (full_name, id, birth_day)
+
+    def __len__(self):
+        return len(self.ids) + len(self.delta)
+
+    def build(self, rows):
+        """
+        Строит основную часть из строк (full_name, id, birth_day) заново.
+        Args:
+            rows: Список строк; будет отсортирован на месте
+        """
+        rows.sort()
+        names = [row[0].encode() for row in rows]
+        offsets = array("q", [0])
+        position = 0
+        for name in names:
+            position += len(name)
+            offsets.append(position)
+
+        self.blob = b"".join(names)
+        self.offsets = offsets
+        self.ids = array("q", [row[1] for row in rows])
+        self.birth_days = array("l", [row[2] for row in rows])
+        self.delta = []
+
+    def rows(self):
+        """Возвращает все строки части в виде списка (full_name, id, birth_day)"""
+        names = _SortedNames(self.blob, self.offsets)
+        base = [(names[index].decode(), self.ids[index], self.birth_days[index]) for index in range(len(self.ids))]
+        return base + self.delta
+
+    def add(self, rows, compact_ratio):
+        """
+        Добавляет новые строки. Если добавочная часть стала слишком большой,
+        основная часть перестраивается целиком.
+        Args:
+            rows: Строки (full_name, id, birth_day)
+            compact_ratio: Допустимая доля добавочной части от основной
+        """
+        if len(self.delta) + len(rows) > max(1000, len(self.ids) * compact_ratio):
+            self.build(self.rows() + rows)
+            return
+        for row in rows:
+            insort(self.delta, row)
+
+    def search(self, prefix):
+        """
+        Находит строки с ФИО, начинающимся на prefix.
+        Yields:
+            tuple: (full_name, id, birth_day) в порядке full_name, id
+        """
+        names = _SortedNames(self.blob, self.offsets)
+        low_key = prefix.encode()
+        start = bisect_left(names, low_key)
+        stop = bisect_left(names, (prefix + _MAX_CHAR).encode(), lo=start)
+        base = ((names[index].decode(), self.ids[index], self.birth_days[index]) for index in range(start, stop))
+
+        delta_start = bisect_left(self.delta, (prefix,))
+        delta_stop = bisect_left(self.delta, (prefix + _MAX_CHAR,), lo=delta_start)
+        return heapq.merge(base, self.delta[delta_start:delta_stop])
+
+    def memory(self):
+        """Примерный объем основной части в байтах"""
+        return (len(self.blob) + self.offsets.itemsize * len(self.offsets)
+                + self.ids.itemsize * len(self.ids) + self.birth_days.itemsize * len(self.birth_days))
+
+
+class PrefixIndex:
+    """
+    Снимок сотрудников в памяти с поиском по началу ФИО
+    """
+    LOAD_QUERY = "SELECT id, full_name, birth_date, gender FROM employees WHERE id > %s ORDER BY id"
+    BOUNDS_QUERY = "SELECT coalesce(min(id), 0), coalesce(max(id), 0) FROM employees"
+    COUNT_QUERY = "SELECT count(*) FROM employees WHERE id <= %s"
+
+    def __init__(self, *, database, chunk_size=10000, compact_ratio=0.05):
+        """
+        Args:
+            database: Объект Database
+            chunk_size: Количество строк, получаемых с сервера за один раз
+            compact_ratio: Доля добавочной части, после которой снимок перестраивается
+        """
+        self.database = database
+        self.chunk_size = chunk_size
+        self.compact_ratio = compact_ratio
+        self.partitions = {}  # пол -> _Partition
+        self.min_id = 0  # Наименьший id в снимке; 0 - снимок пуст
+        self.watermark = 0
+        self.loaded = False
+
+    def __len__(self):
+        return sum(len(partition) for partition in self.partitions.values())
+
+    def load(self):
+        """
+        Загружает снимок заново.
+        Returns:
+            int: Количество строк в снимке
+        """
+        self.partitions = {}
+        self.min_id = 0
+        self.watermark = 0
+        self._fetch(rebuild=True)
+        self.loaded = True
+        return len(self)
+
+    def refresh(self, *, verify=False):
+        """
+        Дочитывает строки, добавленные после последней загрузки.
+        Снимок загружается полностью, если минимальный id в таблице не совпадает со снимком
+        (таблица очищена или заменена: новые строки получают id больше watermark, старые исчезают),
+        максимальный id стал меньше watermark или при verify=True количество старых строк
+        не совпадает со снимком.
+        Args:
+            verify: Проверить количество строк (требует подсчета по таблице)
+        Returns:
+            int: Количество новых строк (для полной перезагрузки - размер снимка)
+        """
+        if not self.loaded:
+            return self.load()
+
+        rows = self.database.query_the_database(query=self.BOUNDS_QUERY, fetch=True)
+        if not rows:
+            return 0
+        min_id, max_id = rows[0]
+
+        # Для пустого снимка любые строки таблицы новые и дочитываются по watermark
+        stale = (self.min_id != 0 and min_id != self.min_id) or max_id < self.watermark
+        if not stale and verify:
+            rows = self.database.query_the_database(query=self.COUNT_QUERY, params=(self.watermark,), fetch=True)
+            stale = bool(rows) and rows[0][0] != len(self)
+        if stale:
+            return self.load()
+        if max_id == self.watermark:
+            return 0
+        return self._fetch(rebuild=False)
+
+    def _fetch(self, *, rebuild):
+        """Читает строки с id больше watermark и раскладывает их по полу"""
+        new_rows = {}
+        fetched = 0
+        for chunk in self.database.stream_query(query=self.LOAD_QUERY, params=(self.watermark,),
+                                                chunk_size=self.chunk_size):
+            for employee_id, full_name, birth_date, gender in chunk:
+                new_rows.setdefault(gender, []).append((full_name, employee_id, birth_date.toordinal()))
+            fetched += len(chunk)
+            if not self.min_id:
+                self.min_id = chunk[0][0]
+            self.watermark = max(self.watermark, chunk[-1][0])
+
+        for gender, rows in new_rows.items():
+            partition = self.partitions.setdefault(gender, _Partition())
+            if rebuild:
+                partition.build(rows)
+            else:
+                partition.add(rows, self.compact_ratio)
+        return fetched
+
+    def search(self, prefix, *, gender=None, limit=None):
+        """
+        Находит сотрудников, ФИО которых начинается на prefix.
+        Args:
+            prefix: Начало ФИО (с учетом регистра)
+            gender: Пол; None - все сотрудники
+            limit: Максимальное количество строк
+        Returns:
+            list: Кортежи (id, full_name, birth_date, gender), как SELECT * FROM employees,
+                  отсортированные по full_name и id
+        """
+        def tagged(partition_gender, partition):
+            return ((row, partition_gender) for row in partition.search(prefix))
+
+        if gender is not None:
+            partition = self.partitions.get(gender)
+            matches = tagged(gender, partition) if partition else iter(())
+        else:
+            matches = heapq.merge(*(tagged(name, partition) for name, partition in self.partitions.items()))
+
+        result = []
+        for (full_name, employee_id, birth_day), row_gender in matches:
+            if limit is not None and len(result) >= limit:
+                break
+            result.append((employee_id, full_name, date.fromordinal(birth_day), row_gender))
+        return result
+
+    def stats(self):
+        """
+        Возвращает сведения о снимке.
+        Returns:
+            dict: Количество строк по полу, диапазон id, размер добавочных частей и примерный объем
+        """
+        return {
+            "rows": {gender: len(partition) for gender, partition in self.partitions.items()},
+            "min_id": self.min_id,
+            "watermark": self.watermark,
+            "delta_rows": sum(len(partition.delta) for partition in self.partitions.values()),
+            "bytes": sum(partition.memory() for partition in self.partitions.values()),
+        }
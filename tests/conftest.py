@@ -0,0 +1,44 @@
+"""
+Общие заглушки для тестов: модули проекта лежат в корне репозитория,
+а вместо PostgreSQL используется таблица сотрудников в памяти.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prefix_index import PrefixIndex  # noqa: E402
+
+
+class FakeDatabase:
+    """
+    Заглушка Database для PrefixIndex: отвечает на его запросы по списку строк
+    (id, full_name, birth_date, gender) и считает обращения к серверу
+    """
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.queries = []
+
+    def query_the_database(self, *, query, params=None, fetch=False, **kwargs):
+        self.queries.append(query)
+        if query == PrefixIndex.BOUNDS_QUERY:
+            ids = [row[0] for row in self.rows]
+            return [(min(ids, default=0), max(ids, default=0))]
+        if query == PrefixIndex.COUNT_QUERY:
+            return [(sum(1 for row in self.rows if row[0] <= params[0]),)]
+        raise AssertionError(f"Неожиданный запрос: {query}")
+
+    def stream_query(self, *, query, params=None, chunk_size=1000):
+        assert query == PrefixIndex.LOAD_QUERY
+        self.queries.append(query)
+        rows = sorted(row for row in self.rows if row[0] > params[0])
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+
+@pytest.fixture
+def fake_database():
+    return FakeDatabase()
@@ -0,0 +1,76 @@
+from cache import MISS, QueryCache
+
+
+def test_make_key_normalizes_whitespace():
+    assert QueryCache.make_key("SELECT *\n  FROM employees", (1,)) == QueryCache.make_key("SELECT * FROM employees", (1,))
+    assert QueryCache.make_key("SELECT 1", (1,)) != QueryCache.make_key("SELECT 1", (2,))
+
+
+def test_get_put_and_counters():
+    cache = QueryCache()
+    key = QueryCache.make_key("SELECT 1")
+
+    assert cache.get(key) is MISS
+    cache.put(key, [(1,)])
+    assert cache.get(key) == [(1,)]
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_none_result_is_cached():
+    cache = QueryCache()
+    cache.put("key", None)
+    assert cache.get("key") is None
+
+
+def test_lru_eviction():
+    cache = QueryCache(max_entries=2)
+    cache.put("a", [(1,)])
+    cache.put("b", [(2,)])
+    cache.get("a")  # "b" становится самой старой записью
+    cache.put("c", [(3,)])
+
+    assert cache.get("b") is MISS
+    assert cache.get("a") == [(1,)]
+    assert cache.get("c") == [(3,)]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    cache = QueryCache(ttl=10)
+    cache.put("a", [(1,)])
+
+    now[0] += 5
+    assert cache.get("a") == [(1,)]
+    now[0] += 6
+    assert cache.get("a") is MISS
+    assert cache.stats()["entries"] == 0
+
+
+def test_memory_limit():
+    rows = [(index, "Foster John Edward") for index in range(100)]
+    size = QueryCache.estimate_size(rows)
+
+    cache = QueryCache(max_bytes=size * 2 - 1)
+    cache.put("too_big", rows * 10)
+    assert cache.get("too_big") is MISS
+
+    cache.put("a", rows)
+    cache.put("b", rows)
+    assert cache.stats()["bytes"] <= size * 2 - 1
+    assert cache.get("a") is MISS
+    assert cache.get("b") == rows
+
+
+def test_invalidate():
+    cache = QueryCache()
+    cache.put("a", [(1,)])
+    cache.invalidate()
+
+    assert cache.get("a") is MISS
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["invalidations"]) == (0, 0, 1)
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from dataset import PROFILES, DatasetProfile, synthetic_names
+
+np = pytest.importorskip("numpy")
+
+from dataset import DatasetGenerator, zipf_weights  # noqa: E402
+
+
+def small_profile(**overrides):
+    return DatasetProfile.from_preset("small", **{"seed": 42, "batch_size": 3000, **overrides})
+
+
+def test_profile_validation():
+    with pytest.raises(ValueError):
+        DatasetProfile(rows=10)
+    with pytest.raises(ValueError):
+        DatasetProfile(male_ratio=1.5)
+    with pytest.raises(ValueError):
+        DatasetProfile(f_selectivity=0.6, male_ratio=0.5)
+    with pytest.raises(ValueError):
+        DatasetProfile.from_preset("unknown")
+
+
+def test_profile_round_trip():
+    profile = small_profile(zipf=1.1)
+    data = profile.to_dict()
+    assert data["f_rows"] == profile.f_rows
+    assert DatasetProfile.from_dict(data).to_dict() == data
+
+
+def test_presets_are_valid():
+    for name in PROFILES:
+        assert DatasetProfile.from_preset(name, seed=1).name == name
+
+
+def test_synthetic_names_unique():
+    names = synthetic_names(500, initials="F", rng=random.Random(1))
+    assert len(set(names)) == 500
+    assert all(name[0] == "F" and name.isalpha() and name.isascii() for name in names)
+
+
+def test_zipf_weights():
+    weights = zipf_weights(10, 1.0)
+    assert abs(weights.sum() - 1) < 1e-9
+    assert weights[0] > weights[-1]
+    assert np.allclose(zipf_weights(4, 0.0), 0.25)
+
+
+def test_batches_match_profile_counts():
+    profile = small_profile()
+    generator = DatasetGenerator(profile)
+    rows = []
+    for index in range(generator.batch_count):
+        batch = generator.generate_batch(index)
+        rows += zip(batch["full_name"], batch["birth_date"], batch["gender"])
+
+    assert len(rows) == profile.rows
+    assert sum(gender == "Male" for _, _, gender in rows) == profile.male_rows
+    f_rows = sum(gender == "Male" and name.startswith("F") and name.split()[0] in generator.f_surnames
+                 for name, _, gender in rows)
+    assert f_rows == profile.f_rows
+    assert all(len(name.split()) == 3 for name, _, _ in rows)
+
+
+def test_batches_are_reproducible():
+    first = DatasetGenerator(small_profile()).generate_batch(1)
+    second = DatasetGenerator(small_profile()).generate_batch(1)
+    other_seed = DatasetGenerator(small_profile(seed=7)).generate_batch(1)
+
+    assert first == second
+    assert first != other_seed
+
+
+def test_batch_to_copy_buffer():
+    batch = {"full_name": ["Foster John Edward"], "birth_date": ["1990-01-02"], "gender": ["Male"]}
+    assert DatasetGenerator.batch_to_copy_buffer(batch).read() == b"Foster John Edward\t1990-01-02\tMale\n"
@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+
+from main import Employee, EmployeeImporter, EmployeeManager, EmployeeView
+
+
+def test_validate_full_name_normalizes():
+    assert Employee.validate_full_name("  smith   john\tedward ") == ("Smith John Edward", None)
+    assert Employee.validate_full_name("Smith John")[0] is None
+    assert Employee.validate_full_name("Smith John Edward1")[0] is None
+    assert Employee.validate_full_name("A" * 50 + " B " + "C" * 50)[0] is None
+    assert Employee.validate_full_name(None)[0] is None
+
+
+def test_validate_many_matches_setters():
+    full_names = ["smith  john edward", "Smith John", "Smith Jöhn Edward", None, "A" * 50 + " B " + "C" * 50, 1]
+    birth_dates = ["1990-01-02", "1990-1-2", "02.01.1990", None, "1990-01-02", 5]
+    genders = ["male", "Female", "other", None, "Male", 1]
+    records, codes = Employee.validate_many(full_names=full_names, birth_dates=birth_dates, genders=genders)
+
+    assert records[0].as_tuple() == ("Smith John Edward", date(1990, 1, 2), "Male")
+    assert codes[0] == Employee.VALID
+    assert codes[1] == Employee.ERR_NAME_WORDS
+    assert codes[2] == Employee.ERR_NAME_CHARS | Employee.ERR_DATE_FORMAT | Employee.ERR_GENDER_VALUE
+    assert codes[3] == Employee.ERR_NAME_EMPTY | Employee.ERR_DATE_EMPTY | Employee.ERR_GENDER_EMPTY
+    assert codes[4] == Employee.ERR_NAME_LENGTH
+    assert codes[5] == Employee.ERR_NAME_WORDS | Employee.ERR_DATE_FORMAT | Employee.ERR_GENDER_VALUE
+    assert all(record is None for record in records[1:])
+
+    # Одинаковые правила со статическими проверками сеттеров
+    for full_name, birth_date, gender, code in zip(full_names, birth_dates, genders, codes):
+        setter_errors = [Employee.validate_full_name(full_name)[1], Employee.validate_birth_date(birth_date)[1],
+                         Employee.validate_gender(gender)[1]]
+        assert (code == Employee.VALID) == (setter_errors == [None, None, None])
+
+
+def test_describe_errors():
+    messages = Employee.describe_errors(Employee.ERR_NAME_WORDS | Employee.ERR_GENDER_VALUE)
+    assert messages == [Employee.ERROR_MESSAGES[Employee.ERR_NAME_WORDS],
+                        Employee.ERROR_MESSAGES[Employee.ERR_GENDER_VALUE]]
+
+
+def test_validate_records_keeps_line_numbers():
+    records = [
+        (2, {"full_name": "foster  john edward", "birth_date": "1990-01-02", "gender": "Male"}, None),
+        (3, None, "Некорректный JSON"),
+        (4, {"full_name": "Foster", "birth_date": "1990-01-02", "gender": "Male"}, None),
+    ]
+    valid, rejects = EmployeeImporter.validate_records(records)
+
+    assert valid == [(2, records[0][1], ("Foster John Edward", date(1990, 1, 2), "Male"))]
+    assert [line_number for line_number, _, _ in rejects] == [3, 4]
+
+
+def test_rows_to_copy_buffer_escapes():
+    rows = [("a\\b\tc\nd\re", date(2000, 1, 2), "Male")]
+    assert EmployeeManager.rows_to_copy_buffer(rows).read() == "a\\\\b\\tc\\nd\\re\t2000-01-02\tMale\n"
+
+
+def test_cursor_round_trip():
+    row = (42, "Foster John Edward", date(1990, 1, 2), "Male")
+    for direction in ("next", "prev"):
+        token = EmployeeView.encode_cursor(direction, row)
+        assert EmployeeView.decode_cursor(token) == (direction, "Foster John Edward", 42)
+
+
+@pytest.mark.parametrize("token", ["", "not-a-token", EmployeeView.encode_cursor("up", (1, "A B C"))])
+def test_decode_cursor_rejects_bad_tokens(token):
+    with pytest.raises(ValueError):
+        EmployeeView.decode_cursor(token)
+
+
+def test_escape_like():
+    assert EmployeeView.escape_like("50%_a\\") == "50\\%\\_a\\\\"
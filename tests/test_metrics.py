@@ -0,0 +1,76 @@
+import json
+
+from metrics import BUCKETS, Histogram, QueryMetrics, Timer, statement_label
+
+
+def test_statement_label_fingerprint():
+    assert statement_label("SELECT *\n   FROM employees;") == statement_label("SELECT * FROM employees")
+    assert statement_label("SELECT * FROM employees") != statement_label("SELECT count(*) FROM employees")
+    assert statement_label("COPY employees FROM STDIN").startswith("copy:")
+    assert statement_label("EXECUTE find_employee_f(%s)") == "execute:find_employee_f"
+    assert statement_label("  ") == "empty"
+
+
+def test_histogram_buckets():
+    histogram = Histogram()
+    for value in (0.0001, 0.003, 100.0):
+        histogram.observe(value)
+
+    assert histogram.count == 3
+    assert histogram.cumulative()[-1] == 3
+    assert histogram.counts[BUCKETS.index(0.005)] == 1
+
+
+def test_record_and_summary():
+    metrics = QueryMetrics()
+    query = "SELECT * FROM employees WHERE id = %s"
+    metrics.record(query=query, phases={"connect": 0.0, "execute": 0.01, "fetch": 0.002}, rows=3)
+    metrics.record(query=query, phases={"execute": 0.02}, error="boom")
+
+    label = statement_label(query)
+    summary = metrics.summary()[label]
+    assert summary["execute"]["count"] == 2
+    assert abs(summary["execute"]["total"] - 0.03) < 1e-9
+    assert metrics.rows[label] == 3
+    assert metrics.errors[label] == 1
+    assert metrics.statements[label] == query
+
+
+def test_explicit_label():
+    metrics = QueryMetrics()
+    metrics.record(query="SELECT 1", phases={"execute": 0.001}, label="health")
+    assert "health" in metrics.summary()
+
+
+def test_slow_query_log(tmp_path):
+    log = tmp_path / "slow.log"
+    metrics = QueryMetrics(slow_query_threshold=0.1, slow_query_log=str(log))
+    metrics.record(query="SELECT 1", phases={"execute": 0.05})
+    metrics.record(query="SELECT  pg_sleep(1);", params=(1,), phases={"execute": 0.2}, rows=1)
+
+    entries = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    assert metrics.slow_queries == 1
+    assert len(entries) == 1
+    assert entries[0]["query"] == "SELECT pg_sleep(1)"
+    assert entries[0]["params"] == "(1,)"
+
+
+def test_prometheus_output():
+    metrics = QueryMetrics()
+    metrics.record(query='SELECT "x" FROM employees', phases={"execute": 0.001}, rows=1)
+    text = metrics.to_prometheus()
+    label = statement_label('SELECT "x" FROM employees')
+
+    assert f'employees_query_duration_seconds_count{{statement="{label}",phase="execute"}} 1' in text
+    assert f'employees_query_rows_total{{statement="{label}"}} 1' in text
+    assert 'query="SELECT \\"x\\" FROM employees"' in text
+
+
+def test_timer_accumulates():
+    phases = {}
+    with Timer(phases, "execute"):
+        pass
+    first = phases["execute"]
+    with Timer(phases, "execute"):
+        pass
+    assert phases["execute"] >= first
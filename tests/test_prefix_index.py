@@ -0,0 +1,150 @@
+import random
+from datetime import date
+
+import pytest
+
+from conftest import FakeDatabase
+from prefix_index import PrefixIndex
+
+SURNAMES = ["Foster", "Fisher", "Ford", "Fox", "Smith", "Brown", "Fa", "F", "Garcia", "Fletcher"]
+NAMES = ["John", "Mary", "Peter", "Anna"]
+
+
+def make_rows(count, *, start_id=1, seed=0):
+    """Строки (id, full_name, birth_date, gender) со случайными, в том числе повторяющимися ФИО"""
+    rng = random.Random(seed)
+    return [
+        (employee_id, f"{rng.choice(SURNAMES)} {rng.choice(NAMES)} {rng.choice(NAMES)}",
+         date(1950 + rng.randrange(60), rng.randrange(1, 13), rng.randrange(1, 29)),
+         rng.choice(["Male", "Female"]))
+        for employee_id in range(start_id, start_id + count)
+    ]
+
+
+def reference(rows, prefix, gender=None, limit=None):
+    """Поиск перебором: тот же результат, что SELECT ... LIKE 'prefix%' ORDER BY full_name, id при collation "C" """
+    found = sorted(
+        (row for row in rows if row[1].startswith(prefix) and (gender is None or row[3] == gender)),
+        key=lambda row: (row[1], row[0]),
+    )
+    return found if limit is None else found[:limit]
+
+
+def assert_matches(index, rows):
+    for prefix in ("", "F", "Fo", "Fox", "Fa", "Smith J", "Z"):
+        for gender in (None, "Male", "Female"):
+            assert index.search(prefix, gender=gender) == reference(rows, prefix, gender)
+    assert index.search("F", limit=5) == reference(rows, "F", limit=5)
+
+
+def test_load_matches_reference():
+    database = FakeDatabase(make_rows(500))
+    index = PrefixIndex(database=database, chunk_size=64)
+
+    assert index.load() == 500
+    assert len(index) == 500
+    assert index.stats()["min_id"] == 1
+    assert index.watermark == 500
+    assert_matches(index, database.rows)
+
+
+def test_search_unknown_gender_is_empty():
+    index = PrefixIndex(database=FakeDatabase(make_rows(50)))
+    index.load()
+    assert index.search("F", gender="Other") == []
+
+
+def test_refresh_appends_new_rows_to_delta():
+    database = FakeDatabase(make_rows(2000))
+    index = PrefixIndex(database=database, chunk_size=100)
+    index.load()
+
+    database.rows += make_rows(30, start_id=2001, seed=1)
+    assert index.refresh() == 30
+    assert index.stats()["delta_rows"] == 30
+    assert index.watermark == 2030
+    assert_matches(index, database.rows)
+
+
+def test_refresh_without_changes_reads_nothing():
+    database = FakeDatabase(make_rows(100))
+    index = PrefixIndex(database=database)
+    index.load()
+    database.queries.clear()
+
+    assert index.refresh() == 0
+    assert database.queries == [PrefixIndex.BOUNDS_QUERY]
+
+
+def test_large_delta_is_compacted():
+    database = FakeDatabase(make_rows(100))
+    index = PrefixIndex(database=database, compact_ratio=0.05)
+    index.load()
+
+    # Добавочная часть каждого пола не больше max(1000, 5% основной), поэтому 3000 строк
+    # (примерно по 1500 на пол) вызывают перестроение обеих частей
+    database.rows += make_rows(3000, start_id=101, seed=2)
+    assert index.refresh() == 3000
+    assert index.stats()["delta_rows"] == 0
+    assert_matches(index, database.rows)
+
+
+@pytest.mark.parametrize("new_count", [50, 150, 400])
+def test_refresh_detects_table_reload(new_count):
+    # Очистка (DELETE/TRUNCATE) и загрузка заново не сбрасывают последовательность id:
+    # новые строки получают id больше watermark, поэтому max(id) не уменьшается
+    database = FakeDatabase(make_rows(200))
+    index = PrefixIndex(database=database)
+    index.load()
+
+    database.rows = make_rows(new_count, start_id=201, seed=3)
+    assert index.refresh() == new_count
+    assert len(index) == new_count
+    assert index.stats()["min_id"] == 201
+    assert_matches(index, database.rows)
+
+
+def test_refresh_detects_emptied_table():
+    database = FakeDatabase(make_rows(100))
+    index = PrefixIndex(database=database)
+    index.load()
+
+    database.rows = []
+    assert index.refresh() == 0
+    assert len(index) == 0
+
+    database.rows = make_rows(10, start_id=500, seed=4)
+    assert index.refresh() == 10
+    assert_matches(index, database.rows)
+
+
+def test_refresh_detects_deleted_first_row():
+    database = FakeDatabase(make_rows(100))
+    index = PrefixIndex(database=database)
+    index.load()
+
+    del database.rows[0]
+    index.refresh()
+    assert len(index) == 99
+    assert_matches(index, database.rows)
+
+
+def test_verify_detects_deleted_middle_rows():
+    database = FakeDatabase(make_rows(100))
+    index = PrefixIndex(database=database)
+    index.load()
+
+    del database.rows[40:50]
+    assert index.refresh() == 0
+    assert len(index) == 100  # Без проверки удаление из середины не видно
+
+    index.refresh(verify=True)
+    assert len(index) == 90
+    assert_matches(index, database.rows)
+
+
+def test_refresh_loads_when_not_loaded():
+    database = FakeDatabase(make_rows(20))
+    index = PrefixIndex(database=database)
+    assert index.refresh() == 20
+    assert index.loaded